@@ -6,8 +6,44 @@ y actualización del mismo archivo con las columnas:
 - is_correct
 """
 
+import argparse
+import asyncio
+import contextlib
+import cProfile
 import csv
-from typing import Tuple, Optional
+import decimal
+import functools
+import glob
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import operator
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita el motor vectorizado
+    np = None
+
+# Filas que el motor vectorizado procesa juntas en cada lote
+TAMANO_LOTE = 65536
+
+# Tamaño del búfer de lectura y escritura de los CSV (1 MiB)
+TAMANO_BUFFER = 1 << 20
 
 
 def leer_ruta_csv() -> str:
@@ -28,6 +64,145 @@ def convertir_numero(valor: str) -> float:
     return float(valor)
 
 
+# ===================== REGISTRO DE OPERACIONES =====================
+
+class Operacion:
+    """
+    Operación registrada con sus dos implementaciones:
+
+    - escalar(a, b): calcula una fila; lanza una excepción si hay error.
+    - lote(a, b): recibe dos arreglos de NumPy y retorna (resultados, errores).
+      Si es None, el motor vectorizado usa la versión escalar fila por fila.
+    - costo(a, b): estima los bits del resultado con operandos enteros; el
+      modo exacto lo usa para rechazar filas demasiado caras. Si es None, la
+      operación se considera barata.
+    - tolerancia: con qué tolerancia se compara contra correct_result. Si es
+      None, se usa TOLERANCIA_POR_DEFECTO.
+    """
+
+    def __init__(self,
+                 codigo: str,
+                 escalar: Callable[[float, float], float],
+                 lote: Optional[Callable] = None,
+                 costo: Optional[Callable[[int, int], float]] = None,
+                 tolerancia: Optional["Tolerancia"] = None) -> None:
+        self.codigo = codigo
+        self.escalar = escalar
+        self.lote = lote
+        self.costo = costo
+        self.tolerancia = tolerancia
+
+    def calcular_lote(self, a: "np.ndarray", b: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Calcula la operación sobre dos arreglos con la mejor versión disponible."""
+        if self.lote is not None:
+            with np.errstate(all="ignore"):
+                return self.lote(a, b)
+
+        resultados = np.full(a.shape, np.nan)
+        errores = np.zeros(a.shape, dtype=bool)
+        for i, (x, y) in enumerate(zip(a.tolist(), b.tolist())):
+            try:
+                resultados[i] = self.escalar(x, y)
+            except Exception:
+                errores[i] = True
+        return resultados, errores
+
+
+# Código u alias normalizado (strip + upper) → Operacion
+OPERACIONES: Dict[str, Operacion] = {}
+
+
+def registrar_operacion(codigo: str,
+                        escalar: Callable[[float, float], float],
+                        lote: Optional[Callable] = None,
+                        alias: Sequence[str] = (),
+                        costo: Optional[Callable[[int, int], float]] = None,
+                        tolerancia: Optional["Tolerancia"] = None) -> Operacion:
+    """Registra una operación (y sus alias) para la ruta fila a fila y la vectorizada."""
+    operacion = Operacion(codigo.upper(), escalar, lote, costo, tolerancia)
+    for nombre in [codigo, *alias]:
+        OPERACIONES[nombre.strip().upper()] = operacion
+    buscar_operacion.cache_clear()
+    return operacion
+
+
+@functools.lru_cache(maxsize=1024)
+def buscar_operacion(texto: str) -> Optional[Operacion]:
+    """
+    Devuelve la operación que corresponde al texto de la columna 'operation'.
+
+    La normalización se hace una vez por texto distinto gracias a la caché;
+    las filas siguientes con el mismo texto son una sola búsqueda.
+    """
+    return OPERACIONES.get(texto.strip().upper())
+
+
+def _sin_errores(resultados: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    return resultados, np.zeros(resultados.shape, dtype=bool)
+
+
+def _dividir_lote(funcion: Callable) -> Callable:
+    """Versión por lotes de una división: los divisores cero se marcan como error."""
+    def lote(a, b):
+        errores = b == 0
+        resultados = np.full(a.shape, np.nan)
+        funcion(a, b, out=resultados, where=~errores)
+        return resultados, errores
+    return lote
+
+
+def _potencia(a, b):
+    resultado = a ** b
+    # Una base negativa con exponente fraccionario da un complejo; igual que
+    # en la versión por lotes, se reporta como error
+    if isinstance(resultado, complex):
+        raise ValueError("La potencia no tiene resultado real")
+    return resultado
+
+
+def _potencia_lote(a, b):
+    # np.power y ** de Python pueden diferir en el último bit (1 ULP), así que
+    # computed_result puede cambiar en el último dígito entre la ruta por
+    # lotes y la fila a fila (la tolerancia por defecto lo absorbe)
+    resultados = np.power(a, b)
+    # Python lanza OverflowError (o ZeroDivisionError con 0 ** -n) donde
+    # NumPy devuelve inf; una base negativa con exponente fraccionario da
+    # NaN. Todos esos casos se reportan como error.
+    errores = ~np.isfinite(resultados) & np.isfinite(a) & np.isfinite(b)
+    return resultados, errores
+
+
+def _bits_potencia(a: int, b: int) -> float:
+    """Bits aproximados de a ** b, sin calcularlo."""
+    if b <= 0 or abs(a) <= 1:
+        return 0.0
+    return b * math.log2(abs(a))
+
+
+def _bits_producto(a: int, b: int) -> float:
+    return float(abs(a).bit_length() + abs(b).bit_length())
+
+
+def _logaritmo_lote(a, b):
+    errores = (a <= 0) | (b <= 0) | (b == 1)
+    return np.log(a) / np.log(b), errores
+
+
+registrar_operacion("SUM", operator.add, lambda a, b: _sin_errores(a + b))
+registrar_operacion("RES", operator.sub, lambda a, b: _sin_errores(a - b), alias=["SUB"])
+registrar_operacion("MUL", operator.mul, lambda a, b: _sin_errores(a * b),
+                    costo=_bits_producto)
+registrar_operacion("DIV", operator.truediv, _dividir_lote(np.divide) if np else None)
+registrar_operacion("POW", _potencia, _potencia_lote, costo=_bits_potencia)
+registrar_operacion("MOD", operator.mod, _dividir_lote(np.mod) if np else None)
+registrar_operacion("FLOORDIV", operator.floordiv, _dividir_lote(np.floor_divide) if np else None)
+registrar_operacion("LOG", math.log, _logaritmo_lote)
+
+# Registro tal como queda al importar el módulo; lo que cambie después se
+# envía a los procesos de procesar_en_paralelo (ver estado_registro)
+_OPERACIONES_INICIALES = dict(OPERACIONES)
+
+
 def calcular_operacion(operation: str,
                        op1: float,
                        op2: float) -> Tuple[Optional[float], bool]:
@@ -39,35 +214,132 @@ def calcular_operacion(operation: str,
       - resultado None si hubo error (ej. división por cero).
       - hubo_error True si la operación no se pudo realizar.
     """
-    op = operation.strip().upper()
+    operacion = buscar_operacion(operation)
+    if operacion is None:
+        # Operación desconocida
+        return None, True
 
     try:
-        if op == "SUM":
-            return op1 + op2, False
-        elif op == "RES":
-            return op1 - op2, False
-        elif op == "MUL":
-            return op1 * op2, False
-        elif op == "DIV":
-            if op2 == 0:
-                return None, True
-            return op1 / op2, False
-        elif op == "POW":
-            return op1 ** op2, False
-        else:
-            # Operación desconocida
-            return None, True
+        return operacion.escalar(op1, op2), False
     except Exception:
-        # Cualquier otro error inesperado
+        # División por cero, desbordamiento u otro error inesperado
         return None, True
 
 
-def comparar_resultados(calculado: float, texto_correcto: str) -> bool:
+# ===================== TOLERANCIAS Y COMPARACIÓN =====================
+
+def _clave_ulp(x: float) -> int:
+    """Entero sin signo que ordena los float64 igual que sus valores."""
+    bits = struct.unpack("<Q", struct.pack("<d", x))[0]
+    return bits ^ 0xFFFF_FFFF_FFFF_FFFF if bits >> 63 else bits | (1 << 63)
+
+
+class Tolerancia:
+    """
+    Cuándo un resultado calculado coincide con el esperado.
+
+    Coincide si son iguales, si |calculado - esperado| <= absoluta +
+    relativa * |esperado| (como numpy.isclose), o si están a lo sumo a
+    'ulps' valores float64 de distancia (cuando ulps no es None).
+    """
+
+    __slots__ = ("relativa", "absoluta", "ulps")
+
+    def __init__(self,
+                 relativa: float = 0.0,
+                 absoluta: float = 0.0,
+                 ulps: Optional[int] = None) -> None:
+        self.relativa = relativa
+        self.absoluta = absoluta
+        self.ulps = ulps
+
+    def __repr__(self) -> str:
+        return f"Tolerancia(relativa={self.relativa}, absoluta={self.absoluta}, ulps={self.ulps})"
+
+    def acepta(self, calculado: float, esperado: float) -> bool:
+        if isinstance(calculado, complex):
+            # Una operación registrada puede devolver un complejo; nunca
+            # coincide con un correct_result real
+            return False
+        if calculado == esperado:
+            return True
+        if abs(calculado - esperado) <= self.absoluta + self.relativa * abs(esperado):
+            return True
+        if self.ulps is None or math.isnan(calculado) or math.isnan(esperado):
+            return False
+        return abs(_clave_ulp(calculado) - _clave_ulp(esperado)) <= self.ulps
+
+    def acepta_lote(self, calculados: "np.ndarray", esperados: "np.ndarray") -> "np.ndarray":
+        """Versión por lotes de acepta."""
+        with np.errstate(invalid="ignore", over="ignore"):
+            aciertos = (calculados == esperados) | (
+                np.abs(calculados - esperados) <= self.absoluta + self.relativa * np.abs(esperados)
+            )
+        if self.ulps is not None:
+            aciertos |= (~np.isnan(calculados) & ~np.isnan(esperados)
+                         & (distancia_ulps(calculados, esperados) <= self.ulps))
+        return aciertos
+
+
+def distancia_ulps(a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """Cantidad de valores float64 entre a y b, elemento a elemento (uint64)."""
+    claves = []
+    for x in (a, b):
+        bits = np.asarray(x, dtype=np.float64).view(np.uint64)
+        claves.append(np.where(bits >> 63, ~bits, bits | (1 << 63)))
+    return np.maximum(*claves) - np.minimum(*claves)
+
+
+# La tolerancia absoluta es la que se usaba siempre; la relativa evita que
+# resultados grandes (como los de POW) fallen por el último dígito
+TOLERANCIA_POR_DEFECTO = Tolerancia(relativa=1e-9, absoluta=1e-6)
+
+
+def tolerancia_de(operation: str) -> Tolerancia:
+    """Tolerancia con la que se verifica una fila de la operación 'operation'."""
+    operacion = buscar_operacion(operation)
+    if operacion is None or operacion.tolerancia is None:
+        return TOLERANCIA_POR_DEFECTO
+    return operacion.tolerancia
+
+
+def configurar_tolerancia(tolerancia: Tolerancia, codigo: Optional[str] = None) -> None:
+    """
+    Cambia la tolerancia de una operación registrada, o la tolerancia por
+    defecto si codigo es None.
+    """
+    global TOLERANCIA_POR_DEFECTO
+    if codigo is None:
+        TOLERANCIA_POR_DEFECTO = tolerancia
+        return
+    operacion = buscar_operacion(codigo)
+    if operacion is None:
+        raise ValueError(f"Operación desconocida: {codigo}")
+    operacion.tolerancia = tolerancia
+
+
+def leer_tolerancia(texto: str) -> Tuple[Optional[str], Tolerancia]:
+    """
+    Interpreta '[OP=]RELATIVA,ABSOLUTA[,ULPS]', por ejemplo 'POW=1e-12,0'.
+
+    Retorna (codigo, tolerancia); codigo es None si no se indicó operación.
+    """
+    codigo, _, valores = texto.rpartition("=")
+    partes = valores.split(",")
+    if len(partes) not in (2, 3):
+        raise ValueError(f"Tolerancia inválida: {texto!r}")
+    ulps = int(partes[2]) if len(partes) == 3 else None
+    return codigo.strip() or None, Tolerancia(float(partes[0]), float(partes[1]), ulps)
+
+
+def comparar_resultados(calculado: float,
+                        texto_correcto: str,
+                        tolerancia: Optional[Tolerancia] = None) -> bool:
     """
     Compara el resultado calculado con el valor de la columna correct_result.
 
-    - Si correct_result se puede convertir a número, compara con tolerancia
-      para flotantes.
+    - Si correct_result se puede convertir a número, compara con la
+      'tolerancia' (por defecto, TOLERANCIA_POR_DEFECTO).
     - Si no, compara como cadenas.
     """
     if texto_correcto is None:
@@ -79,91 +351,2605 @@ def comparar_resultados(calculado: float, texto_correcto: str) -> bool:
 
     try:
         esperado = float(texto_correcto)
-        # Tolerancia para números flotantes
-        return abs(calculado - esperado) < 1e-6
     except ValueError:
         # Si no es número, comparamos como texto
         return str(calculado) == texto_correcto
+    return (tolerancia or TOLERANCIA_POR_DEFECTO).acepta(calculado, esperado)
+
+
+# ===================== ARITMÉTICA EXACTA =====================
+
+# Tope de bits para un resultado entero en modo exacto. Queda por debajo del
+# límite de dígitos que Python permite al convertir un int a texto (4300 por
+# defecto), que es lo que se escribe en computed_result.
+MAX_BITS_EXACTOS = 14000
+
+# Tolerancia relativa al comparar un entero exacto con un correct_result
+# escrito en notación científica
+TOLERANCIA_RELATIVA_EXACTA = decimal.Decimal("1e-9")
+
+
+def max_bits_texto() -> float:
+    """
+    Bits que puede tener un entero para que Python lo convierta a texto con
+    el límite de dígitos vigente (sys.get_int_max_str_digits; 0 es sin límite).
+    """
+    digitos = sys.get_int_max_str_digits() if hasattr(sys, "get_int_max_str_digits") else 0
+    if digitos == 0:
+        return math.inf
+    # |n| < 2 ** bits <= 10 ** digitos
+    return math.floor(digitos * math.log2(10))
+
+
+def cabe_en_texto(valor) -> bool:
+    """False si 'valor' es un entero demasiado grande para escribirlo como texto."""
+    return not isinstance(valor, int) or valor.bit_length() <= max_bits_texto()
 
 
-def procesar_archivo_csv(ruta_csv: str) -> None:
-    """Lee, procesa y sobrescribe el archivo CSV con los resultados."""
+def convertir_numero_exacto(valor: str):
+    """Convierte el texto a int si representa un entero; si no, a float."""
     try:
-        with open(ruta_csv, "r", newline="", encoding="utf-8") as f_in:
-            lector = csv.DictReader(f_in)
-            filas = []
-            total = 0
-            correctas = 0
-            errores = 0
-
-            # Encabezados originales
-            fieldnames = lector.fieldnames or []
-
-            # Aseguramos que las columnas nuevas estén
-            columnas_nuevas = ["computed_result", "is_correct"]
-            for col in columnas_nuevas:
-                if col not in fieldnames:
-                    fieldnames.append(col)
-
-            for fila in lector:
-                total += 1
-
-                operation = fila.get("operation", "")
-                op1_txt = fila.get("operand_1", "")
-                op2_txt = fila.get("operand_2", "")
-
-                try:
-                    op1 = convertir_numero(op1_txt)
-                    op2 = convertir_numero(op2_txt)
-                except ValueError:
-                    # No se pueden convertir los operandos
-                    fila["computed_result"] = "ERROR"
-                    fila["is_correct"] = "False"
-                    errores += 1
-                    filas.append(fila)
-                    continue
-
-                resultado, hubo_error = calcular_operacion(operation, op1, op2)
-
-                if hubo_error or resultado is None:
-                    fila["computed_result"] = "ERROR"
-                    fila["is_correct"] = "False"
-                    errores += 1
-                else:
-                    fila["computed_result"] = resultado
-                    texto_correct = fila.get("correct_result")
-                    if "correct_result" in fila and texto_correct is not None:
-                        es_correcto = comparar_resultados(resultado, texto_correct)
-                        fila["is_correct"] = str(es_correcto)
-                        if es_correcto:
-                            correctas += 1
-                    else:
-                        # No hay columna correct_result en el CSV
-                        fila["is_correct"] = ""
-
-                filas.append(fila)
-
-    except FileNotFoundError:
-        print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+        return int(valor)
+    except ValueError:
+        return float(valor)
+
+
+def calcular_operacion_exacta(operation: str,
+                              op1,
+                              op2,
+                              max_bits: float = MAX_BITS_EXACTOS) -> Tuple[Optional[float], bool]:
+    """
+    Como calcular_operacion, pero con operandos enteros el resultado es exacto
+    (por ejemplo 1000 ** 1000 no desborda).
+
+    Antes de calcular se estima el tamaño del resultado con el costo de la
+    operación; si supera 'max_bits' la fila se rechaza como error sin
+    calcularla, para que una fila hostil no bloquee el proceso. Un resultado
+    que no se puede escribir como texto (ver cabe_en_texto) también es error.
+    """
+    operacion = buscar_operacion(operation)
+    if operacion is None:
+        # Operación desconocida
+        return None, True
+
+    if (operacion.costo is not None
+            and isinstance(op1, int) and isinstance(op2, int)
+            and operacion.costo(op1, op2) > max_bits):
+        return None, True
+
+    try:
+        resultado = operacion.escalar(op1, op2)
+    except Exception:
+        return None, True
+    if not cabe_en_texto(resultado):
+        return None, True
+    return resultado, False
+
+
+def comparar_resultados_exacto(calculado,
+                               texto_correcto: str,
+                               tolerancia: Optional[Tolerancia] = None) -> bool:
+    """
+    Como comparar_resultados, pero un resultado entero se compara sin pasar
+    por float ('tolerancia' solo se usa con resultados float).
+
+    Si correct_result es un entero se exige igualdad exacta; si está en
+    notación decimal o científica (ej. '1e+3000') se compara con Decimal
+    usando una tolerancia relativa, sin desbordar.
+    """
+    if not isinstance(calculado, int):
+        return comparar_resultados(calculado, texto_correcto, tolerancia)
+    if texto_correcto is None:
+        return False
+
+    texto_correcto = texto_correcto.strip()
+    if texto_correcto == "":
+        return False
+
+    try:
+        return calculado == int(texto_correcto)
+    except ValueError:
+        pass
+
+    try:
+        esperado = decimal.Decimal(texto_correcto)
+    except decimal.InvalidOperation:
+        # Si no es número, comparamos como texto
+        return str(calculado) == texto_correcto
+    if not esperado.is_finite():
+        return False
+
+    calculado = decimal.Decimal(calculado)
+    # Si la cantidad de dígitos ya difiere, no hace falta restar
+    if abs(calculado.adjusted() - esperado.adjusted()) > 1:
+        return False
+    diferencia = abs(calculado - esperado)
+    return diferencia <= TOLERANCIA_RELATIVA_EXACTA * abs(esperado) or diferencia < decimal.Decimal("1e-6")
+
+
+# ===================== MOTOR VECTORIZADO =====================
+
+def _requiere_numpy() -> None:
+    """Lanza un error claro si NumPy no está instalado."""
+    if np is None:
+        raise RuntimeError(
+            "El motor vectorizado requiere NumPy (pip install numpy)."
+        )
+
+
+def calcular_operaciones_lote(operaciones: Sequence[str],
+                              op1: "np.ndarray",
+                              op2: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Calcula un lote completo de operaciones con NumPy.
+
+    Equivale a llamar calcular_operacion fila por fila: las filas se agrupan
+    por operación y cada grupo se calcula de una vez con la versión por lotes
+    registrada en OPERACIONES. Los resultados pueden diferir en el último bit
+    de los de la ruta fila a fila (p. ej. np.power frente a **).
+
+    Retorna:
+      (resultados, errores)
+      - resultados: arreglo float64 (NaN donde hubo error).
+      - errores: arreglo booleano, True si la operación no se pudo realizar
+        (división por cero, operación desconocida, desbordamiento, etc.).
+    """
+    _requiere_numpy()
+    codigos, textos = _codificar_operaciones(operaciones)
+    return calcular_operaciones_codificadas(codigos, textos, op1, op2)
+
+
+def calcular_operaciones_codificadas(codigos: "np.ndarray",
+                                     textos: Sequence[str],
+                                     op1: "np.ndarray",
+                                     op2: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Como calcular_operaciones_lote, pero con las operaciones ya codificadas:
+    textos[codigos[i]] es el texto de la operación de la fila i.
+    """
+    _requiere_numpy()
+    op1 = np.asarray(op1, dtype=np.float64)
+    op2 = np.asarray(op2, dtype=np.float64)
+
+    # Una búsqueda en el registro por texto distinto, no por fila
+    distintas: List[Operacion] = []
+    tabla = np.full(len(textos), -1, dtype=np.int32)
+    for i, texto in enumerate(textos):
+        operacion = buscar_operacion(str(texto))
+        if operacion is None:
+            continue
+        if operacion not in distintas:
+            distintas.append(operacion)
+        tabla[i] = distintas.index(operacion)
+    tipo = tabla[codigos]
+
+    # Las operaciones desconocidas (tipo -1) quedan como error
+    resultados = np.full(op1.shape, np.nan)
+    errores = np.ones(op1.shape, dtype=bool)
+    for k, operacion in enumerate(distintas):
+        filas = np.flatnonzero(tipo == k)
+        resultados[filas], errores[filas] = operacion.calcular_lote(op1[filas], op2[filas])
+
+    resultados[errores] = np.nan
+    return resultados, errores
+
+
+def _codificar_operaciones(operaciones: Sequence[str]) -> Tuple["np.ndarray", list]:
+    """
+    Asigna un código entero a cada texto de operación distinto.
+
+    Retorna (codigos, textos) donde textos[codigo] es el texto original.
+    """
+    bytes_ = isinstance(operaciones, np.ndarray) and operaciones.dtype.kind == "S"
+    if bytes_ and operaciones.dtype.itemsize <= 8:
+        # Textos de hasta 8 bytes se agrupan como enteros, sin crear un objeto
+        # por fila (como en _codificar_bytes). Con textos más largos np.unique
+        # ordena cadenas y es más lento que el diccionario de abajo.
+        unicas, codigos = np.unique(operaciones.astype("S8").view(np.uint64),
+                                    return_inverse=True)
+        textos = [texto.decode("utf-8", "replace") for texto in unicas.view("S8").tolist()]
+        return codigos.reshape(-1).astype(np.int32), textos
+    if isinstance(operaciones, np.ndarray):
+        operaciones = operaciones.tolist()
+    distintos = {texto: i for i, texto in enumerate(dict.fromkeys(operaciones))}
+    codigos = np.fromiter(
+        map(distintos.__getitem__, operaciones),
+        dtype=np.int32,
+        count=len(operaciones),
+    )
+    if bytes_:
+        return codigos, [texto.decode("utf-8", "replace") for texto in distintos]
+    return codigos, list(distintos)
+
+
+def _convertir_columna(textos: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Convierte una columna de texto a float64.
+
+    Retorna (valores, invalidos); invalidos marca las filas que
+    convertir_numero habría rechazado.
+    """
+    try:
+        return np.array(textos, dtype=np.float64), np.zeros(len(textos), dtype=bool)
+    except ValueError:
+        pass
+
+    # Lo habitual es que los inválidos sean celdas vacías (correct_result
+    # de las filas con error); esas se marcan sin convertir uno a uno
+    vacios = np.fromiter(map(operator.not_, textos), dtype=bool, count=len(textos))
+    if vacios.any():
+        try:
+            valores = np.array([texto or "nan" for texto in textos], dtype=np.float64)
+        except ValueError:
+            pass
+        else:
+            valores[vacios] = np.nan
+            return valores, vacios
+
+    # Hay al menos un valor inválido: se convierte uno a uno
+    valores = np.empty(len(textos))
+    invalidos = np.zeros(len(textos), dtype=bool)
+    for i, texto in enumerate(textos):
+        try:
+            valores[i] = convertir_numero(texto)
+        except ValueError:
+            valores[i] = np.nan
+            invalidos[i] = True
+    return valores, invalidos
+
+
+class Resumen:
+    """Contadores acumulados durante el procesamiento de un archivo."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.correctas = 0
+        self.errores = 0
+        # Filas sin cambios que el modo incremental no volvió a calcular
+        self.omitidas = 0
+
+    def registrar(self, estado: str) -> None:
+        """Suma una fila según el estado devuelto por procesar_fila."""
+        self.total += 1
+        if estado == "correcta":
+            self.correctas += 1
+        elif estado == "error":
+            self.errores += 1
+
+    def sumar(self, total: int, correctas: int, errores: int) -> None:
+        """Suma de una vez los totales de un lote de filas."""
+        self.total += total
+        self.correctas += correctas
+        self.errores += errores
+
+    def agregar(self, otro: "Resumen") -> None:
+        """Acumula los totales de otro archivo."""
+        self.sumar(otro.total, otro.correctas, otro.errores)
+        self.omitidas += otro.omitidas
+
+
+class Columnas:
+    """
+    Posición de cada columna conocida en el encabezado de salida.
+
+    Se resuelve una sola vez por archivo, así cada fila se maneja como la
+    lista que entrega csv.reader, sin armar un dict por fila. Las columnas
+    de entrada que no están en el encabezado quedan en None.
+    """
+
+    __slots__ = ("operation", "operand_1", "operand_2", "correct_result",
+                 "computed_result", "is_correct", "ancho")
+
+    def __init__(self, fieldnames: Sequence[str]) -> None:
+        posiciones = {nombre: i for i, nombre in enumerate(fieldnames)}
+        for nombre in self.__slots__[:-1]:
+            setattr(self, nombre, posiciones.get(nombre))
+        self.ancho = len(fieldnames)
+
+    def ajustar(self, fila: List[str]) -> None:
+        """Completa con "" (o recorta) la fila al ancho del encabezado de salida."""
+        if len(fila) < self.ancho:
+            fila.extend([""] * (self.ancho - len(fila)))
+        else:
+            del fila[self.ancho:]
+
+
+def procesar_fila(fila: List[str],
+                  columnas: Columnas,
+                  operar: Callable = calcular_operacion,
+                  exacto: bool = False,
+                  convertir: Optional[Callable] = None,
+                  comparar: Optional[Callable] = None) -> str:
+    """
+    Calcula y compara una fila, llenando 'computed_result' e 'is_correct'.
+
+    'operar' calcula la operación; por defecto calcular_operacion, o el
+    método calcular de una CacheOperaciones. Con exacto=True los operandos
+    enteros se mantienen como int (ver calcular_operacion_exacta).
+    'convertir' y 'comparar' reemplazan a las funciones por defecto (la
+    instrumentación los usa para medir cada etapa).
+
+    Retorna el estado de la fila:
+      - "error" si los operandos no son válidos o la operación falló.
+      - "correcta" / "incorrecta" según la columna correct_result.
+      - "sin_referencia" si el CSV no tiene correct_result.
+    """
+    c = columnas
+    # Una fila más corta que el encabezado no trae correct_result
+    tiene_referencia = c.correct_result is not None and c.correct_result < len(fila)
+    if len(fila) != c.ancho:
+        c.ajustar(fila)
+
+    operation = fila[c.operation] if c.operation is not None else ""
+    op1_txt = fila[c.operand_1] if c.operand_1 is not None else ""
+    op2_txt = fila[c.operand_2] if c.operand_2 is not None else ""
+
+    if convertir is None:
+        convertir = convertir_numero_exacto if exacto else convertir_numero
+    if comparar is None:
+        comparar = comparar_resultados_exacto if exacto else comparar_resultados
+
+    try:
+        op1 = convertir(op1_txt)
+        op2 = convertir(op2_txt)
+    except ValueError:
+        # No se pueden convertir los operandos
+        fila[c.computed_result] = "ERROR"
+        fila[c.is_correct] = "False"
+        return "error"
+
+    resultado, hubo_error = operar(operation, op1, op2)
+
+    if hubo_error or resultado is None:
+        fila[c.computed_result] = "ERROR"
+        fila[c.is_correct] = "False"
+        return "error"
+
+    fila[c.computed_result] = resultado
+    if tiene_referencia:
+        es_correcto = comparar(resultado, fila[c.correct_result], tolerancia_de(operation))
+        fila[c.is_correct] = str(es_correcto)
+        return "correcta" if es_correcto else "incorrecta"
+
+    # No hay columna correct_result en el CSV
+    fila[c.is_correct] = ""
+    return "sin_referencia"
+
+
+def procesar_lote(filas: List[List[str]],
+                  columnas: Columnas,
+                  resumen: Resumen,
+                  destino: Optional["EscritorColumnar"] = None,
+                  informe: Optional["InformeDiscrepancias"] = None) -> None:
+    """
+    Versión vectorizada de procesar_fila para una lista de filas.
+
+    Llena 'computed_result' e 'is_correct' en cada fila con la misma
+    semántica que la ruta fila a fila y acumula los totales en 'resumen'.
+    Con un 'destino' las columnas del lote también se guardan en binario, y
+    con un 'informe' se anotan las filas que no coinciden.
+    """
+    if not filas:
         return
 
-    # Escribimos de nuevo el archivo con resultados
-    with open(ruta_csv, "w", newline="", encoding="utf-8") as f_out:
-        escritor = csv.DictWriter(f_out, fieldnames=fieldnames)
-        escritor.writeheader()
-        escritor.writerows(filas)
+    c = columnas
+    # Una sola pasada: se anota qué filas traen correct_result y se ajustan
+    # al ancho de salida sin llamar a Columnas.ajustar por fila
+    referencias = np.empty(len(filas), dtype=bool)
+    minimo_referencia = c.correct_result + 1 if c.correct_result is not None else c.ancho + 1
+    relleno = [""] * c.ancho
+    for i, fila in enumerate(filas):
+        n = len(fila)
+        referencias[i] = n >= minimo_referencia
+        if n < c.ancho:
+            fila += relleno[n:]
+        elif n > c.ancho:
+            del fila[c.ancho:]
 
-    print("\nProcesamiento completado.")
-    print(f"Filas procesadas: {total}")
-    if "correct_result" in fieldnames:
-        print(f"Resultados correctos según 'correct_result': {correctas}")
-    print(f"Operaciones con error (incluye división por cero): {errores}")
+    def columna(posicion: Optional[int]) -> List[str]:
+        if posicion is None:
+            return [""] * len(filas)
+        return [fila[posicion] for fila in filas]
+
+    operaciones = columna(c.operation)
+    op1, invalido1 = _convertir_columna(columna(c.operand_1))
+    op2, invalido2 = _convertir_columna(columna(c.operand_2))
+
+    codigos, textos = _codificar_operaciones(operaciones)
+    resultados, errores = calcular_operaciones_codificadas(codigos, textos, op1, op2)
+    errores |= invalido1 | invalido2
+
+    # correct_result se convierte una sola vez para todo el lote
+    if c.correct_result is not None:
+        esperados, _ = _convertir_columna(columna(c.correct_result))
+        aciertos = verificar_lote(codigos, textos, resultados, errores, esperados) & referencias
+    else:
+        esperados = np.full(len(filas), np.nan)
+        aciertos = np.zeros(len(filas), dtype=bool)
+
+    # 1 correcta, 0 incorrecta o error, -1 sin referencia (ver COLUMNAS_BINARIAS)
+    estados = np.where(referencias | errores, aciertos, -1).astype(np.int8)
+    textos_estado = {1: "True", 0: "False", -1: ""}
+    for fila, resultado, hubo_error, estado in zip(
+            filas, resultados.tolist(), errores.tolist(), estados.tolist()):
+        if hubo_error:
+            fila[c.computed_result] = "ERROR"
+            fila[c.is_correct] = "False"
+        else:
+            fila[c.computed_result] = resultado
+            fila[c.is_correct] = textos_estado[estado]
+
+    resumen.sumar(len(filas), int(aciertos.sum()), int(errores.sum()))
+    if destino is not None:
+        destino.agregar(codigos, textos, op1, op2, resultados, errores, estados)
+    if informe is not None:
+        informe.agregar(codigos, textos, esperados, resultados, errores, aciertos, referencias)
+
+
+# ===================== PIPELINE POR ETAPAS =====================
+
+def leer_filas(f_in) -> Tuple[List[str], Columnas, Iterator[List[str]]]:
+    """
+    Prepara la lectura de un CSV abierto.
+
+    Retorna los encabezados (con las columnas nuevas agregadas), la posición
+    de cada columna y un iterador que entrega las filas una a una como
+    listas. Las líneas vacías se omiten, igual que con csv.DictReader.
+    """
+    lector = csv.reader(f_in)
+
+    # Encabezados originales
+    fieldnames = columnas_de_salida(next(lector, []))
+    return fieldnames, Columnas(fieldnames), filter(None, lector)
+
+
+def columnas_de_salida(encabezado: Sequence[str]) -> List[str]:
+    """Devuelve el encabezado con las columnas nuevas agregadas al final."""
+    fieldnames = list(encabezado)
+
+    # Aseguramos que las columnas nuevas estén
+    columnas_nuevas = ["computed_result", "is_correct"]
+    for col in columnas_nuevas:
+        if col not in fieldnames:
+            fieldnames.append(col)
+
+    return fieldnames
+
+
+def calcular_filas(filas: Iterable[List[str]],
+                   columnas: Columnas,
+                   resumen: Resumen,
+                   **opciones) -> Iterator[List[str]]:
+    """
+    Calcula y compara cada fila a medida que llega, sin acumularlas.
+
+    'opciones' se pasan a procesar_fila.
+    """
+    for fila in filas:
+        resumen.registrar(procesar_fila(fila, columnas, **opciones))
+        yield fila
+
+
+def calcular_lotes(filas: Iterable[List[str]],
+                   columnas: Columnas,
+                   resumen: Resumen,
+                   tamano_lote: int = TAMANO_LOTE,
+                   destino: Optional["EscritorColumnar"] = None,
+                   informe: Optional["InformeDiscrepancias"] = None) -> Iterator[List[str]]:
+    """Como calcular_filas, pero procesa lotes de filas con el motor vectorizado."""
+    filas = iter(filas)
+    while True:
+        lote = list(itertools.islice(filas, tamano_lote))
+        if not lote:
+            return
+        procesar_lote(lote, columnas, resumen, destino, informe)
+        yield from lote
+
+
+def escribir_filas(f_out,
+                   fieldnames: List[str],
+                   filas: Iterable[List[str]],
+                   encabezado: bool = True) -> None:
+    """Escribe el encabezado y las filas procesadas en un CSV abierto."""
+    escritor = csv.writer(f_out)
+    if encabezado:
+        escritor.writerow(fieldnames)
+    escritor.writerows(filas)
+
+
+def escribir_atomico(ruta_csv: str, escribir, binario: bool = False) -> None:
+    """
+    Escribe en un archivo temporal junto a 'ruta_csv' y lo renombra al final.
+
+    'escribir' recibe el archivo temporal abierto (en modo binario si
+    binario=True). Si algo falla, el archivo original queda intacto y el
+    temporal se elimina.
+    """
+    carpeta = os.path.dirname(os.path.abspath(ruta_csv))
+    fd, ruta_tmp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(ruta_csv)}.", suffix=".tmp", dir=carpeta
+    )
+    try:
+        if binario:
+            f_tmp = os.fdopen(fd, "wb", buffering=TAMANO_BUFFER)
+        else:
+            f_tmp = os.fdopen(fd, "w", newline="", encoding="utf-8", buffering=TAMANO_BUFFER)
+        with f_tmp:
+            escribir(f_tmp)
+        # mkstemp crea el archivo con permisos 0600; conservamos los del original
+        shutil.copymode(ruta_csv, ruta_tmp)
+        os.replace(ruta_tmp, ruta_csv)
+    except BaseException:
+        os.remove(ruta_tmp)
+        raise
+
+
+# ===================== PIPELINE ASÍNCRONO =====================
+
+# Lotes que pueden esperar en cada cola entre etapas; acota la memoria
+PROFUNDIDAD_COLA = 4
+
+# Filas por lote del pipeline asíncrono: con lotes más chicos que
+# TAMANO_LOTE las etapas empiezan a solaparse antes
+LOTE_ASINCRONO = 8192
+
+
+def _calcular_lista(calcular: Callable,
+                    lote: List[List[str]],
+                    columnas: Columnas,
+                    resumen: Resumen) -> List[List[str]]:
+    return list(calcular(lote, columnas, resumen))
+
+
+async def pipeline_asincrono(filas: Iterator[List[str]],
+                             columnas: Columnas,
+                             calcular: Callable,
+                             resumen: Resumen,
+                             f_out,
+                             fieldnames: List[str],
+                             tamano_lote: int = LOTE_ASINCRONO,
+                             profundidad: int = PROFUNDIDAD_COLA) -> None:
+    """
+    Lectura, cálculo y escritura como tres etapas de asyncio unidas por
+    colas acotadas.
+
+    Cada etapa hace su trabajo bloqueante en un hilo propio, así mientras
+    se calcula un lote se lee el siguiente y se escribe el anterior. Si una
+    cola se llena, la etapa que la alimenta espera: en memoria hay como
+    mucho unos 2 * profundidad + 3 lotes de 'tamano_lote' filas.
+
+    'calcular' es una etapa como calcular_filas o calcular_lotes; recibe
+    los lotes en orden desde un solo hilo.
+    """
+    loop = asyncio.get_running_loop()
+    leidos: asyncio.Queue = asyncio.Queue(maxsize=profundidad)
+    calculados: asyncio.Queue = asyncio.Queue(maxsize=profundidad)
+    escritor = csv.writer(f_out)
+    escritor.writerow(fieldnames)
+
+    with ThreadPoolExecutor(1) as hilo_lectura, \
+            ThreadPoolExecutor(1) as hilo_calculo, \
+            ThreadPoolExecutor(1) as hilo_escritura:
+
+        # Un lote vacío marca el final del archivo
+        async def leer() -> None:
+            while True:
+                lote = await loop.run_in_executor(
+                    hilo_lectura, lambda: list(itertools.islice(filas, tamano_lote))
+                )
+                await leidos.put(lote)
+                if not lote:
+                    return
+
+        async def procesar() -> None:
+            while True:
+                lote = await leidos.get()
+                if lote:
+                    lote = await loop.run_in_executor(
+                        hilo_calculo, _calcular_lista, calcular, lote, columnas, resumen
+                    )
+                await calculados.put(lote)
+                if not lote:
+                    return
+
+        async def escribir() -> None:
+            while True:
+                lote = await calculados.get()
+                if not lote:
+                    return
+                await loop.run_in_executor(hilo_escritura, escritor.writerows, lote)
+
+        etapas = [asyncio.ensure_future(etapa()) for etapa in (leer, procesar, escribir)]
+        try:
+            await asyncio.gather(*etapas)
+        except BaseException:
+            # Si una etapa falla, las otras quedarían esperando en su cola
+            for etapa in etapas:
+                etapa.cancel()
+            raise
+
+
+# ===================== PROCESAMIENTO EN PARALELO =====================
+
+def dividir_en_rangos(ruta_csv: str, partes: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Divide el cuerpo del CSV en rangos de bytes que empiezan y terminan en
+    un salto de línea.
+
+    Retorna el encabezado original y la lista de rangos (inicio, fin).
+    Supone que ningún campo contiene saltos de línea entre comillas, como
+    ocurre en los archivos de operaciones.
+    """
+    tamano = os.path.getsize(ruta_csv)
+    with open(ruta_csv, "rb") as f:
+        encabezado = next(csv.reader([f.readline().decode("utf-8")]), [])
+        inicio = f.tell()
+
+        cortes = [inicio]
+        for k in range(1, partes):
+            f.seek(max(inicio + (tamano - inicio) * k // partes - 1, cortes[-1]))
+            f.readline()  # avanzamos hasta el final de la línea actual
+            if f.tell() > cortes[-1]:
+                cortes.append(f.tell())
+        if tamano > cortes[-1]:
+            cortes.append(tamano)
+
+    return encabezado, list(zip(cortes, cortes[1:]))
+
+
+def _leer_rango(ruta_csv: str, inicio: int, fin: int) -> Iterator[str]:
+    """Entrega las líneas del archivo entre los bytes 'inicio' y 'fin'."""
+    with open(ruta_csv, "rb") as f:
+        f.seek(inicio)
+        posicion = inicio
+        while posicion < fin:
+            linea = f.readline()
+            if not linea:
+                return
+            posicion += len(linea)
+            yield linea.decode("utf-8")
+
+
+def estado_registro() -> tuple:
+    """
+    Cambios al registro y a las tolerancias desde que se importó el módulo.
+
+    Un proceso creado con spawn o forkserver vuelve a importar el módulo y
+    no los ve; _iniciar_trabajador los aplica. Las operaciones registradas
+    después de importar se envían completas, así que sus funciones deben
+    poder serializarse con pickle.
+    """
+    tolerancias = {}
+    nuevas = {}
+    for nombre, operacion in OPERACIONES.items():
+        if _OPERACIONES_INICIALES.get(nombre) is operacion:
+            tolerancias[nombre] = operacion.tolerancia
+        else:
+            nuevas[nombre] = operacion
+    return TOLERANCIA_POR_DEFECTO, tolerancias, nuevas
+
+
+def _iniciar_trabajador(estado: tuple) -> None:
+    """Inicializador de cada proceso: aplica el estado_registro del proceso principal."""
+    global TOLERANCIA_POR_DEFECTO
+    TOLERANCIA_POR_DEFECTO, tolerancias, nuevas = estado
+    for nombre, tolerancia in tolerancias.items():
+        OPERACIONES[nombre].tolerancia = tolerancia
+    OPERACIONES.update(nuevas)
+    buscar_operacion.cache_clear()
+
+
+def _procesar_rango(ruta_csv: str,
+                    inicio: int,
+                    fin: int,
+                    encabezado: List[str],
+                    ruta_parte: str,
+                    vectorizado: bool,
+                    opciones: dict) -> Tuple[int, int, int]:
+    """
+    Trabajo de cada proceso: calcula las filas de un rango de bytes y las
+    escribe (sin encabezado) en 'ruta_parte'. 'opciones' se pasa a
+    calcular_filas (por ejemplo, para el modo exacto).
 
+    Retorna los contadores (total, correctas, errores) del rango.
+    """
+    if vectorizado:
+        calcular = calcular_lotes
+    else:
+        calcular = functools.partial(calcular_filas, **opciones)
+    resumen = Resumen()
+    fieldnames = columnas_de_salida(encabezado)
+    filas = filter(None, csv.reader(_leer_rango(ruta_csv, inicio, fin)))
+    with open(ruta_parte, "w", newline="", encoding="utf-8", buffering=TAMANO_BUFFER) as f_out:
+        escribir_filas(
+            f_out,
+            fieldnames,
+            calcular(filas, Columnas(fieldnames), resumen),
+            encabezado=False,
+        )
+    return resumen.total, resumen.correctas, resumen.errores
+
+
+def procesar_en_paralelo(ruta_csv: str,
+                         trabajadores: int,
+                         vectorizado: bool,
+                         resumen: Resumen,
+                         opciones: Optional[dict] = None) -> List[str]:
+    """
+    Procesa el CSV repartiendo rangos de bytes entre varios procesos.
+
+    Cada proceso escribe su parte en un archivo temporal; al final las partes
+    se unen en el orden original de las filas y reemplazan al CSV. Los
+    contadores de cada parte se suman en 'resumen'.
+
+    Retorna los encabezados del archivo de salida.
+    """
+    # Más rangos que procesos para repartir mejor la carga
+    encabezado, rangos = dividir_en_rangos(ruta_csv, trabajadores * 4)
+    fieldnames = columnas_de_salida(encabezado)
+
+    carpeta = os.path.dirname(os.path.abspath(ruta_csv))
+    partes = []
+    try:
+        for _ in rangos:
+            fd, ruta_parte = tempfile.mkstemp(
+                prefix=f".{os.path.basename(ruta_csv)}.", suffix=".parte", dir=carpeta
+            )
+            os.close(fd)
+            partes.append(ruta_parte)
+
+        # Las tolerancias y operaciones configuradas viajan a cada proceso;
+        # con spawn o forkserver no se heredan
+        with ProcessPoolExecutor(max_workers=trabajadores,
+                                 initializer=_iniciar_trabajador,
+                                 initargs=(estado_registro(),)) as ejecutor:
+            futuros = [
+                ejecutor.submit(
+                    _procesar_rango, ruta_csv, inicio, fin, encabezado, ruta_parte,
+                    vectorizado, opciones or {},
+                )
+                for (inicio, fin), ruta_parte in zip(rangos, partes)
+            ]
+            for futuro in futuros:
+                resumen.sumar(*futuro.result())
+
+        def unir_partes(f_out) -> None:
+            escribir_filas(f_out, fieldnames, [])
+            f_out.flush()
+            for ruta_parte in partes:
+                with open(ruta_parte, "r", newline="", encoding="utf-8") as f_parte:
+                    shutil.copyfileobj(f_parte, f_out)
+
+        escribir_atomico(ruta_csv, unir_partes)
+    finally:
+        for ruta_parte in partes:
+            os.remove(ruta_parte)
+
+    return fieldnames
+
+
+# ===================== LECTOR MAPEADO EN MEMORIA =====================
+
+# Bytes del archivo que se analizan juntos; cada tramo termina en un salto
+# de línea
+TAMANO_TRAMO = 1 << 21
+
+# Números de hasta este ancho se convierten directo desde los bytes; los
+# demás (o con formatos como 1e5, inf o espacios) pasan por convertir_numero
+ANCHO_MAXIMO_NUMERO = 24
+
+# Con hasta 15 dígitos la mantisa es un entero exacto en float64, así que
+# mantisa / 10**decimales queda bien redondeado, igual que float(texto)
+MAX_DIGITOS_RAPIDOS = 15
+
+# Textos de operación más largos que esto se decodifican uno a uno
+ANCHO_MAXIMO_OPERACION = 32
+
+_COMA, _SALTO, _RETORNO, _PUNTO = ord(","), ord("\n"), ord("\r"), ord(".")
+
+
+class FormatoNoMapeable(ValueError):
+    """El CSV no tiene la forma simple que el lector mapeado sabe analizar."""
+
+
+class ColumnasOperaciones:
+    """
+    Columnas de un CSV de operaciones como arreglos de NumPy.
+
+    - codigos / categorias: operación de cada fila, categorias[codigos[i]].
+    - op1, op2: operandos en float64 (NaN si no son números).
+    - invalido1, invalido2: operandos que convertir_numero rechazaría.
+    - esperado: correct_result en float64 (NaN si no es número), o None si
+      el CSV no tiene esa columna.
+    """
+
+    __slots__ = ("codigos", "categorias", "op1", "op2",
+                 "invalido1", "invalido2", "esperado")
+
+    def __init__(self, codigos, categorias, op1, op2, invalido1, invalido2, esperado) -> None:
+        self.codigos = codigos
+        self.categorias = categorias
+        self.op1 = op1
+        self.op2 = op2
+        self.invalido1 = invalido1
+        self.invalido2 = invalido2
+        self.esperado = esperado
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+
+class _PlanMapeado:
+    """Encabezado del CSV mapeado y posición de las columnas que se leen."""
+
+    def __init__(self, mapeo: mmap.mmap) -> None:
+        fin = mapeo.find(b"\n")
+        self.inicio_datos = len(mapeo) if fin == -1 else fin + 1
+        linea = mapeo[:self.inicio_datos].rstrip(b"\r\n")
+        if not linea or b'"' in linea or b"\r" in linea:
+            raise FormatoNoMapeable("encabezado vacío o con comillas")
+
+        encabezado = linea.decode("utf-8").split(",")
+        self.fieldnames = columnas_de_salida(encabezado)
+        self.columnas = Columnas(self.fieldnames)
+        self.campos = len(encabezado)
+        c = self.columnas
+        if None in (c.operation, c.operand_1, c.operand_2):
+            raise FormatoNoMapeable("faltan columnas de entrada")
+
+        # Cada línea de salida es un prefijo de la de entrada más los dos
+        # resultados, así que estos tienen que ser las últimas columnas
+        if (c.computed_result, c.is_correct) != (c.ancho - 2, c.ancho - 1):
+            raise FormatoNoMapeable("computed_result e is_correct no están al final")
+        self.prefijo = c.ancho - 2
+
+        if mapeo.find(b'"', self.inicio_datos) != -1:
+            raise FormatoNoMapeable("el archivo tiene campos entre comillas")
+
+    def encabezado_salida(self) -> bytes:
+        texto = io.StringIO()
+        csv.writer(texto).writerow(self.fieldnames)
+        return texto.getvalue().encode("utf-8")
+
+
+@contextlib.contextmanager
+def _mapear_csv(ruta_csv: str) -> Iterator[mmap.mmap]:
+    """Abre 'ruta_csv' mapeado en memoria, solo lectura."""
+    with open(ruta_csv, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise FormatoNoMapeable("archivo vacío")
+        mapeo = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapeo
+    except BaseException as exc:
+        # Los arreglos que apuntan al mapeo siguen vivos en los frames del
+        # traceback y no dejarían cerrarlo
+        traceback.clear_frames(exc.__traceback__)
+        raise
+    finally:
+        mapeo.close()
+
+
+def _limites_tramos(mapeo: mmap.mmap, inicio: int) -> Iterator[Tuple[int, int]]:
+    """Rangos de bytes de unos TAMANO_TRAMO bytes que terminan en un salto de línea."""
+    total = len(mapeo)
+    while inicio < total:
+        fin = min(inicio + TAMANO_TRAMO, total)
+        if fin < total:
+            salto = mapeo.rfind(b"\n", inicio, fin)
+            if salto == -1:
+                salto = mapeo.find(b"\n", fin)
+            fin = total if salto == -1 else salto + 1
+        yield inicio, fin
+        inicio = fin
+
+
+def _matriz_campos(tramo: "np.ndarray",
+                   inicios: "np.ndarray",
+                   largos: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Copia cada campo en una fila de una matriz de bytes rellena con ceros.
+
+    Retorna (matriz, dentro); dentro marca las posiciones que son del campo.
+    """
+    posiciones = np.arange(max(int(largos.max(initial=0)), 1))
+    dentro = posiciones < largos[:, None]
+    matriz = tramo[np.where(dentro, inicios[:, None] + posiciones, 0)]
+    matriz[~dentro] = 0
+    return matriz, dentro
+
+
+def _convertir_bytes(tramo: "np.ndarray",
+                     inicios: "np.ndarray",
+                     fines: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Convierte campos numéricos directo desde los bytes del tramo.
+
+    Los campos de la forma [+-]dígitos[.dígitos] con hasta
+    MAX_DIGITOS_RAPIDOS dígitos se convierten con NumPy; el resto pasa por
+    convertir_numero. Retorna (valores, invalidos) como _convertir_columna.
+    """
+    largos = fines - inicios
+    valores = np.full(len(largos), np.nan)
+    invalidos = np.zeros(len(largos), dtype=bool)
+    lentos = np.ones(len(largos), dtype=bool)
+
+    filas = np.flatnonzero((largos > 0) & (largos <= ANCHO_MAXIMO_NUMERO))
+    if len(filas):
+        matriz, dentro = _matriz_campos(tramo, inicios[filas], largos[filas])
+        signo = (matriz[:, 0] == ord("-")) | (matriz[:, 0] == ord("+"))
+        digito = dentro & (matriz >= ord("0")) & (matriz <= ord("9"))
+        punto = dentro & (matriz == _PUNTO)
+        otros = dentro & ~digito & ~punto
+        otros[:, 0] &= ~signo
+
+        digitos = digito.sum(axis=1)
+        puntos = punto.sum(axis=1)
+        validos = (~otros.any(axis=1) & (puntos <= 1)
+                   & (digitos >= 1) & (digitos <= MAX_DIGITOS_RAPIDOS))
+
+        # Dígitos que quedan a la derecha de cada posición
+        restantes = np.clip(digitos[:, None] - np.cumsum(digito, axis=1), 0, MAX_DIGITOS_RAPIDOS)
+        potencias = 10 ** np.arange(MAX_DIGITOS_RAPIDOS + 1, dtype=np.int64)
+        mantisa = np.where(digito, (matriz - ord("0")) * potencias[restantes], 0).sum(axis=1)
+        decimales = np.where(
+            puntos == 1, restantes[np.arange(len(filas)), punto.argmax(axis=1)], 0
+        )
+        numeros = mantisa / potencias.astype(np.float64)[decimales]
+        numeros = np.where(matriz[:, 0] == ord("-"), -numeros, numeros)
+
+        valores[filas[validos]] = numeros[validos]
+        lentos[filas[validos]] = False
+
+    for i, inicio, fin in zip(np.flatnonzero(lentos).tolist(),
+                              inicios[lentos].tolist(), fines[lentos].tolist()):
+        try:
+            valores[i] = convertir_numero(tramo[inicio:fin].tobytes())
+        except ValueError:
+            invalidos[i] = True
+    return valores, invalidos
+
+
+def _codificar_bytes(tramo: "np.ndarray",
+                     inicios: "np.ndarray",
+                     fines: "np.ndarray",
+                     categorias: Dict[str, int]) -> "np.ndarray":
+    """
+    Código de operación de cada fila sin decodificar un texto por fila.
+
+    'categorias' (texto -> código) se comparte entre tramos y se amplía con
+    los textos nuevos.
+    """
+    largos = fines - inicios
+    codigos = np.empty(len(largos), dtype=np.int32)
+    cortos = largos <= ANCHO_MAXIMO_OPERACION
+    if cortos.any():
+        matriz, _ = _matriz_campos(tramo, inicios[cortos], largos[cortos])
+        claves = matriz.view(f"S{matriz.shape[1]}").ravel()
+        distintas, inversa = np.unique(claves, return_inverse=True)
+        tabla = np.array(
+            [categorias.setdefault(clave.decode("utf-8"), len(categorias))
+             for clave in distintas.tolist()],
+            dtype=np.int32,
+        )
+        codigos[cortos] = tabla[inversa.ravel()]
+
+    for i in np.flatnonzero(~cortos).tolist():
+        texto = tramo[inicios[i]:fines[i]].tobytes().decode("utf-8")
+        codigos[i] = categorias.setdefault(texto, len(categorias))
+    return codigos
+
+
+def _analizar_tramo(tramo: "np.ndarray", plan: _PlanMapeado, categorias: Dict[str, int]) -> tuple:
+    """
+    Separa un tramo en líneas y campos y convierte las columnas de entrada.
+
+    Retorna (columnas, inicios, fines_prefijo): las columnas como
+    ColumnasOperaciones y, por cada fila, el rango de bytes de la línea que
+    se copia tal cual a la salida.
+    """
+    saltos = np.flatnonzero(tramo == _SALTO)
+    inicios = np.concatenate(([0], saltos + 1))
+    fines = np.append(saltos, len(tramo))
+    if tramo[-1] == _SALTO:
+        inicios, fines = inicios[:-1], fines[:-1]
+
+    # Fin de línea \r\n; un \r suelto csv.reader lo toma como salto de línea
+    con_retorno = (fines > inicios) & (tramo[np.maximum(fines - 1, 0)] == _RETORNO)
+    if np.count_nonzero(tramo == _RETORNO) != np.count_nonzero(con_retorno):
+        raise FormatoNoMapeable("retorno de carro fuera de un fin de línea")
+    fines = fines - con_retorno
+
+    # csv.reader omite las líneas vacías
+    llenas = fines > inicios
+    inicios, fines = inicios[llenas], fines[llenas]
+
+    comas = np.flatnonzero(tramo == _COMA)
+    primera = np.searchsorted(comas, inicios)
+    separadores = plan.campos - 1
+    if (np.searchsorted(comas, fines) - primera != separadores).any():
+        raise FormatoNoMapeable("filas con distinta cantidad de columnas")
+
+    # El campo j va de bordes[:, j] + 1 a bordes[:, j + 1]
+    bordes = np.empty((len(inicios), plan.campos + 1), dtype=np.int64)
+    bordes[:, 0] = inicios - 1
+    bordes[:, 1:-1] = comas[primera[:, None] + np.arange(separadores)]
+    bordes[:, -1] = fines
+
+    def campo(j: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        return bordes[:, j] + 1, bordes[:, j + 1]
+
+    c = plan.columnas
+    op1, invalido1 = _convertir_bytes(tramo, *campo(c.operand_1))
+    op2, invalido2 = _convertir_bytes(tramo, *campo(c.operand_2))
+    esperado = None
+    if c.correct_result is not None:
+        esperado, _ = _convertir_bytes(tramo, *campo(c.correct_result))
+    columnas = ColumnasOperaciones(
+        _codificar_bytes(tramo, *campo(c.operation), categorias),
+        list(categorias), op1, op2, invalido1, invalido2, esperado,
+    )
+    return columnas, inicios, bordes[:, plan.prefijo]
+
+
+def _contar_saltos(mapeo: mmap.mmap, inicio: int) -> int:
+    """Saltos de línea desde 'inicio', contados por tramos sobre el mapeo."""
+    datos = np.frombuffer(mapeo, dtype=np.uint8)
+    total = 0
+    for desde in range(inicio, len(datos), TAMANO_TRAMO):
+        total += int(np.count_nonzero(datos[desde:desde + TAMANO_TRAMO] == _SALTO))
+    return total
+
+
+def _tramos_analizados(mapeo: mmap.mmap, plan: _PlanMapeado) -> Iterator[tuple]:
+    """
+    Recorre el archivo mapeado por tramos, sin copiarlo.
+
+    Entrega (inicio, columnas, inicios, fines_prefijo) por tramo, con los
+    rangos de cada línea relativos a 'inicio'.
+    """
+    datos = np.frombuffer(mapeo, dtype=np.uint8)
+    categorias: Dict[str, int] = {}
+    for inicio, fin in _limites_tramos(mapeo, plan.inicio_datos):
+        yield (inicio, *_analizar_tramo(datos[inicio:fin], plan, categorias))
+
+
+def leer_columnas_mapeadas(ruta_csv: str) -> ColumnasOperaciones:
+    """
+    Lee las columnas de entrada de un CSV de operaciones con mmap.
+
+    Los operandos se convierten desde los bytes mapeados a arreglos
+    reservados de antemano, sin crear un str por campo, y las operaciones
+    llegan como códigos enteros. Lanza FormatoNoMapeable si el archivo tiene
+    comillas o filas con distinta cantidad de columnas.
+    """
+    _requiere_numpy()
+    with _mapear_csv(ruta_csv) as mapeo:
+        plan = _PlanMapeado(mapeo)
+        # Una fila por salto de línea como máximo (puede haber líneas vacías)
+        maximo = _contar_saltos(mapeo, plan.inicio_datos) + 1
+        codigos = np.empty(maximo, dtype=np.int32)
+        op1, op2 = np.empty(maximo), np.empty(maximo)
+        invalido1 = np.empty(maximo, dtype=bool)
+        invalido2 = np.empty(maximo, dtype=bool)
+        esperado = np.empty(maximo) if plan.columnas.correct_result is not None else None
+
+        n = 0
+        categorias: List[str] = []
+        for _, tramo, _, _ in _tramos_analizados(mapeo, plan):
+            k = n + len(tramo)
+            codigos[n:k], op1[n:k], op2[n:k] = tramo.codigos, tramo.op1, tramo.op2
+            invalido1[n:k], invalido2[n:k] = tramo.invalido1, tramo.invalido2
+            if esperado is not None:
+                esperado[n:k] = tramo.esperado
+            categorias = tramo.categorias
+            n = k
+
+    return ColumnasOperaciones(
+        codigos[:n], categorias, op1[:n], op2[:n], invalido1[:n], invalido2[:n],
+        None if esperado is None else esperado[:n],
+    )
+
+
+def _escribir_mapeado(mapeo: mmap.mmap,
+                      plan: _PlanMapeado,
+                      f_out,
+                      resumen: Resumen,
+                      destino: Optional["EscritorColumnar"],
+                      informe: Optional["InformeDiscrepancias"]) -> None:
+    """Calcula cada tramo con el motor vectorizado y escribe sus líneas."""
+    f_out.write(plan.encabezado_salida())
+    for inicio, tramo, inicios, fines in _tramos_analizados(mapeo, plan):
+        resultados, errores = calcular_operaciones_codificadas(
+            tramo.codigos, tramo.categorias, tramo.op1, tramo.op2
+        )
+        errores |= tramo.invalido1 | tramo.invalido2
+
+        if tramo.esperado is None:
+            estados = [""] * len(tramo)
+            correctas = 0
+            codigos_estado = np.where(errores, 0, -1)
+        else:
+            aciertos = verificar_lote(
+                tramo.codigos, tramo.categorias, resultados, errores, tramo.esperado
+            )
+            estados = np.where(aciertos, "True", "False").tolist()
+            correctas = int(aciertos.sum())
+            codigos_estado = aciertos
+            if informe is not None:
+                informe.agregar(tramo.codigos, tramo.categorias, tramo.esperado,
+                                resultados, errores, aciertos)
+        if destino is not None:
+            destino.agregar(tramo.codigos, tramo.categorias, tramo.op1, tramo.op2,
+                            resultados, errores, codigos_estado)
+
+        # Cada línea de salida: los bytes de la de entrada y luego los resultados
+        partes = [b""] * (2 * len(tramo))
+        partes[::2] = [
+            mapeo[desde:hasta]
+            for desde, hasta in zip((inicios + inicio).tolist(), (fines + inicio).tolist())
+        ]
+        partes[1::2] = [
+            b",ERROR,False\r\n" if hubo_error else f",{resultado},{estado}\r\n".encode("utf-8")
+            for resultado, hubo_error, estado in zip(resultados.tolist(), errores.tolist(), estados)
+        ]
+        f_out.write(b"".join(partes))
+        resumen.sumar(len(tramo), correctas, int(errores.sum()))
+
+
+def procesar_mapeado(ruta_csv: str,
+                     resumen: Resumen,
+                     destino: Optional["EscritorColumnar"] = None,
+                     informe: Optional["InformeDiscrepancias"] = None) -> List[str]:
+    """
+    Procesa el CSV con el lector mapeado y el motor vectorizado.
+
+    El archivo se recorre con mmap por tramos de TAMANO_TRAMO bytes: los
+    operandos se convierten desde el mapeo sin pasar por csv.reader y cada
+    línea de salida copia los bytes de la de entrada, así que la memoria no
+    crece con el tamaño del archivo. Si el archivo tiene comillas o filas
+    irregulares se procesa con el lector CSV por lotes (calcular_lotes).
+    Con un 'destino' las columnas también se guardan en binario, y con un
+    'informe' se anotan las filas que no coinciden con correct_result.
+
+    Retorna los encabezados del archivo de salida.
+    """
+    _requiere_numpy()
+    parcial = Resumen()
+    fieldnames: List[str] = []
+
+    def escribir(f_out) -> None:
+        # El mapeo se cierra antes de reemplazar el archivo
+        with _mapear_csv(ruta_csv) as mapeo:
+            plan = _PlanMapeado(mapeo)
+            _escribir_mapeado(mapeo, plan, f_out, parcial, destino, informe)
+        fieldnames.extend(plan.fieldnames)
+
+    try:
+        escribir_atomico(ruta_csv, escribir, binario=True)
+        resumen.agregar(parcial)
+        return fieldnames
+    except FormatoNoMapeable:
+        for salida in (destino, informe):
+            if salida is not None:
+                salida.reiniciar()
+
+    with open(ruta_csv, "r", newline="", encoding="utf-8", buffering=TAMANO_BUFFER) as f_in:
+        fieldnames, columnas, filas = leer_filas(f_in)
+        escribir_atomico(
+            ruta_csv,
+            lambda f_out: escribir_filas(
+                f_out, fieldnames,
+                calcular_lotes(filas, columnas, resumen, destino=destino, informe=informe),
+            ),
+        )
+    return fieldnames
+
+
+# ===================== SALIDA COLUMNAR =====================
+
+# Columnas del archivo lateral binario y su tipo de NumPy
+COLUMNAS_BINARIAS = {
+    "operation": "<i4",        # código; el texto está en 'categorias'
+    "operand_1": "<f8",
+    "operand_2": "<f8",
+    "computed_result": "<f8",  # NaN donde hubo error
+    "error": "|b1",
+    "is_correct": "|i1",       # 1 correcta, 0 incorrecta o error, -1 sin referencia
+}
+
+
+def ruta_columnar(ruta_csv: str) -> str:
+    """Carpeta donde se guardan las columnas binarias de 'ruta_csv'."""
+    return ruta_csv + ".columnas"
+
+
+class EscritorColumnar:
+    """
+    Guarda los resultados de un CSV en '<csv>.columnas/': un archivo .npy
+    por columna (ver COLUMNAS_BINARIAS) y un meta.json con los textos de
+    las operaciones.
+
+    Las columnas se agregan por lotes a medida que se calculan, sin
+    acumularlas en memoria; el encabezado de cada .npy se completa al
+    confirmar. La carpeta nueva reemplaza a la anterior solo al confirmar,
+    después de escribir el CSV, y un archivo .npy se puede abrir con mmap
+    (ver cargar_columnar).
+    """
+
+    def __init__(self, ruta_csv: str) -> None:
+        self.ruta_csv = ruta_csv
+        self.ruta = ruta_columnar(ruta_csv)
+        self.filas = 0
+        self._categorias: Dict[str, int] = {}
+        self._archivos: Dict[str, object] = {}
+        self._carpeta_tmp: Optional[str] = None
+        self._inicio_datos = 0
+
+    def __enter__(self) -> "EscritorColumnar":
+        _requiere_numpy()
+        carpeta = os.path.dirname(os.path.abspath(self.ruta))
+        self._carpeta_tmp = tempfile.mkdtemp(
+            prefix=f".{os.path.basename(self.ruta)}.", dir=carpeta
+        )
+        for nombre in COLUMNAS_BINARIAS:
+            self._archivos[nombre] = open(
+                os.path.join(self._carpeta_tmp, nombre + ".npy"), "wb", buffering=TAMANO_BUFFER
+            )
+        self._inicio_datos = self._escribir_encabezados()
+        return self
+
+    def _escribir_encabezados(self) -> int:
+        # NumPy deja lugar en el encabezado para que la forma crezca, así
+        # que se puede reescribir al final sin mover los datos
+        for nombre, f in self._archivos.items():
+            f.seek(0)
+            np.lib.format.write_array_header_1_0(f, {
+                "descr": COLUMNAS_BINARIAS[nombre],
+                "fortran_order": False,
+                "shape": (self.filas,),
+            })
+            largo = f.tell()
+            if self._inicio_datos and largo != self._inicio_datos:
+                raise RuntimeError(f"El encabezado de '{nombre}.npy' cambió de tamaño.")
+        return largo
+
+    def agregar(self,
+                codigos: "np.ndarray",
+                categorias: Sequence[str],
+                op1: "np.ndarray",
+                op2: "np.ndarray",
+                resultados: "np.ndarray",
+                errores: "np.ndarray",
+                estados: Sequence[int]) -> None:
+        """
+        Agrega un lote de filas. 'codigos' indexa a 'categorias', que puede
+        ser propia del lote; acá se traduce a los códigos del archivo.
+        """
+        tabla = np.array(
+            [self._categorias.setdefault(texto, len(self._categorias)) for texto in categorias],
+            dtype=np.int32,
+        )
+        columnas = {
+            "operation": tabla[codigos] if len(tabla) else codigos,
+            "operand_1": op1,
+            "operand_2": op2,
+            "computed_result": np.where(errores, np.nan, resultados),
+            "error": errores,
+            "is_correct": estados,
+        }
+        for nombre, valores in columnas.items():
+            arreglo = np.ascontiguousarray(valores, dtype=COLUMNAS_BINARIAS[nombre])
+            self._archivos[nombre].write(arreglo.data)
+        self.filas += len(codigos)
+
+    def reiniciar(self) -> None:
+        """Descarta las filas agregadas (por ejemplo, al cambiar de lector)."""
+        self.filas = 0
+        self._categorias.clear()
+        for f in self._archivos.values():
+            f.seek(self._inicio_datos)
+            f.truncate()
+
+    def confirmar(self) -> None:
+        """Completa los archivos y reemplaza la carpeta anterior."""
+        self._escribir_encabezados()
+        for f in self._archivos.values():
+            f.close()
+
+        # El CSV ya fue reemplazado: se guarda su versión para detectar cambios
+        estado = os.stat(self.ruta_csv)
+        meta = {
+            "filas": self.filas,
+            "categorias": list(self._categorias),
+            "columnas": COLUMNAS_BINARIAS,
+            "csv": {"tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns},
+        }
+        with open(os.path.join(self._carpeta_tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+        if os.path.isdir(self.ruta):
+            anterior = self._carpeta_tmp + ".anterior"
+            os.replace(self.ruta, anterior)
+            os.replace(self._carpeta_tmp, self.ruta)
+            shutil.rmtree(anterior)
+        else:
+            os.replace(self._carpeta_tmp, self.ruta)
+        self._carpeta_tmp = None
+
+    def __exit__(self, *exc) -> bool:
+        for f in self._archivos.values():
+            f.close()
+        if self._carpeta_tmp is not None:
+            # No se confirmó: se descarta la carpeta a medio escribir
+            shutil.rmtree(self._carpeta_tmp, ignore_errors=True)
+        return False
+
+
+class ResultadosColumnares:
+    """
+    Columnas guardadas por EscritorColumnar, abiertas con mmap.
+
+    categorias[codigos[i]] es la operación de la fila i; 'correctos' usa
+    los valores de COLUMNAS_BINARIAS["is_correct"].
+    """
+
+    __slots__ = ("codigos", "categorias", "op1", "op2",
+                 "resultados", "errores", "correctos")
+
+    def __init__(self, codigos, categorias, op1, op2, resultados, errores, correctos) -> None:
+        self.codigos = codigos
+        self.categorias = categorias
+        self.op1 = op1
+        self.op2 = op2
+        self.resultados = resultados
+        self.errores = errores
+        self.correctos = correctos
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+
+def cargar_columnar(ruta_csv: str, verificar: bool = True) -> ResultadosColumnares:
+    """
+    Abre las columnas binarias de 'ruta_csv' sin leer el CSV.
+
+    Con verificar=True lanza ValueError si el CSV cambió después de
+    guardarlas (tamaño o fecha de modificación distintos).
+    """
+    _requiere_numpy()
+    carpeta = ruta_columnar(ruta_csv)
+    with open(os.path.join(carpeta, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if verificar:
+        estado = os.stat(ruta_csv)
+        if [estado.st_size, estado.st_mtime_ns] != [meta["csv"]["tamano"], meta["csv"]["mtime_ns"]]:
+            raise ValueError(
+                f"Las columnas de '{carpeta}' no corresponden a la versión actual de '{ruta_csv}'."
+            )
+
+    arreglos = [
+        np.load(os.path.join(carpeta, nombre + ".npy"), mmap_mode="r")
+        for nombre in COLUMNAS_BINARIAS
+    ]
+    codigos, op1, op2, resultados, errores, correctos = arreglos
+    return ResultadosColumnares(
+        codigos, meta["categorias"], op1, op2, resultados, errores, correctos
+    )
+
+
+# ===================== VERIFICACIÓN POR LOTES =====================
+
+def verificar_lote(codigos: "np.ndarray",
+                   categorias: Sequence[str],
+                   calculados: "np.ndarray",
+                   errores: "np.ndarray",
+                   esperados: "np.ndarray") -> "np.ndarray":
+    """
+    Compara un lote de resultados con correct_result ya convertido a float64.
+
+    Cada operación usa su tolerancia (ver tolerancia_de). Las filas con
+    error o con un esperado que no es número (NaN) nunca coinciden.
+    Retorna un arreglo booleano, True donde el resultado es correcto.
+    """
+    aciertos = np.zeros(len(codigos), dtype=bool)
+    for codigo, texto in enumerate(categorias):
+        filas = np.flatnonzero(codigos == codigo)
+        if len(filas):
+            aciertos[filas] = tolerancia_de(texto).acepta_lote(calculados[filas], esperados[filas])
+    aciertos &= ~errores
+    return aciertos
+
+
+class InformeDiscrepancias:
+    """
+    Filas cuyo resultado no coincide con correct_result, guardadas en
+    '<csv>.discrepancias.tsv' (separado por tabulaciones, para que no se
+    confunda con un CSV de operaciones al procesar una carpeta) con las
+    columnas:
+
+      row, operation, expected, got, error
+
+    'row' es el número de fila de datos (desde 1, sin contar el encabezado
+    ni las líneas vacías) y 'error' es |got - expected|. Si el cálculo
+    falló, got es ERROR; si correct_result no es un número, expected queda
+    vacío. Se escribe por lotes en un temporal que reemplaza al informe
+    anterior al confirmar.
+    """
+
+    COLUMNAS = ["row", "operation", "expected", "got", "error"]
+
+    def __init__(self, ruta_csv: str) -> None:
+        self.ruta_csv = ruta_csv
+        self.ruta = ruta_csv + ".discrepancias.tsv"
+        self.filas = 0
+        self.discrepancias = 0
+        self._f = None
+        self._escritor = None
+        self._ruta_tmp: Optional[str] = None
+
+    def __enter__(self) -> "InformeDiscrepancias":
+        carpeta = os.path.dirname(os.path.abspath(self.ruta))
+        fd, self._ruta_tmp = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.ruta)}.", suffix=".tmp", dir=carpeta
+        )
+        self._f = os.fdopen(fd, "w", newline="", encoding="utf-8", buffering=TAMANO_BUFFER)
+        self._escritor = csv.writer(self._f, delimiter="\t")
+        self._escritor.writerow(self.COLUMNAS)
+        return self
+
+    def agregar(self,
+                codigos: "np.ndarray",
+                categorias: Sequence[str],
+                esperados: "np.ndarray",
+                calculados: "np.ndarray",
+                errores: "np.ndarray",
+                aciertos: "np.ndarray",
+                con_referencia: Optional["np.ndarray"] = None) -> None:
+        """
+        Agrega las filas que fallaron de un lote. 'con_referencia' marca las
+        filas que tienen correct_result (None: todas).
+        """
+        fallidas = ~aciertos if con_referencia is None else con_referencia & ~aciertos
+        indices = np.flatnonzero(fallidas)
+        with np.errstate(invalid="ignore"):
+            diferencias = np.abs(calculados[indices] - esperados[indices])
+        for i, esperado, calculado, hubo_error, diferencia in zip(
+                indices.tolist(), esperados[indices].tolist(), calculados[indices].tolist(),
+                errores[indices].tolist(), diferencias.tolist()):
+            sin_esperado = math.isnan(esperado)
+            self._escritor.writerow([
+                self.filas + i + 1,
+                categorias[codigos[i]],
+                "" if sin_esperado else esperado,
+                "ERROR" if hubo_error else calculado,
+                "" if hubo_error or sin_esperado else diferencia,
+            ])
+        self.filas += len(codigos)
+        self.discrepancias += len(indices)
+
+    def reiniciar(self) -> None:
+        """Descarta las filas agregadas (por ejemplo, al cambiar de lector)."""
+        self.filas = 0
+        self.discrepancias = 0
+        self._f.seek(0)
+        self._f.truncate()
+        self._escritor.writerow(self.COLUMNAS)
+
+    def confirmar(self) -> None:
+        """Cierra el informe y reemplaza al anterior."""
+        self._f.close()
+        shutil.copymode(self.ruta_csv, self._ruta_tmp)
+        os.replace(self._ruta_tmp, self.ruta)
+        self._ruta_tmp = None
+
+    def __exit__(self, *exc) -> bool:
+        if self._f is not None:
+            self._f.close()
+        if self._ruta_tmp is not None:
+            os.remove(self._ruta_tmp)
+        return False
+
+
+# ===================== PROCESAMIENTO INCREMENTAL =====================
+
+# Columnas de entrada que determinan el resultado de una fila
+COLUMNAS_ENTRADA = ["operation", "operand_1", "operand_2", "correct_result"]
+
+# Cabecera del archivo índice (<csv>.idx). La siguen CABECERA_INDICE y
+# 8 bytes de huella por fila
+MAGIA_INDICE = b"E1IDX\x00\x03\x00"
+TAMANO_HUELLA = 8
+
+# Filas procesadas, bytes que ocupan en el CSV (con el encabezado), cuántas
+# eran correctas y cuántas con error, la huella de esos bytes y la de los
+# ajustes con que se calcularon (ver huella_ajustes)
+TAMANO_HUELLA_TRAMO = 16
+CABECERA_INDICE = struct.Struct(f"<4Q{TAMANO_HUELLA_TRAMO}s{TAMANO_HUELLA_TRAMO}s")
+
+# Bytes por lectura al verificar y copiar el tramo ya procesado
+BLOQUE_COPIA = 1 << 20
+
+
+def _copiar_bytes(origen, destino, cantidad: int, huella=None) -> int:
+    """
+    Copia hasta 'cantidad' bytes de 'origen' a 'destino' (si no es None),
+    actualizando 'huella' (si no es None). Retorna los bytes copiados.
+    """
+    copiados = 0
+    while copiados < cantidad:
+        bloque = origen.read(min(BLOQUE_COPIA, cantidad - copiados))
+        if not bloque:
+            break
+        if huella is not None:
+            huella.update(bloque)
+        if destino is not None:
+            destino.write(bloque)
+        copiados += len(bloque)
+    return copiados
+
+
+def huella_fila(fila: Sequence[str], posiciones: Sequence[Optional[int]]) -> bytes:
+    """
+    Resumen de 8 bytes de las columnas de entrada de una fila.
+
+    'posiciones' son las de COLUMNAS_ENTRADA en el encabezado (None si falta).
+    """
+    datos = "\x1f".join(
+        fila[i] if i is not None and i < len(fila) else "" for i in posiciones
+    )
+    return hashlib.blake2b(datos.encode("utf-8"), digest_size=TAMANO_HUELLA).digest()
+
+
+def huella_ajustes(exacto: bool, max_bits: float) -> bytes:
+    """
+    Huella de todo lo que, además de la fila, decide su resultado: el modo
+    exacto y su tope, las tolerancias y el registro de operaciones. Si
+    cambia, ningún resultado guardado sirve.
+    """
+    partes = [f"exacto={exacto}", f"max_bits={max_bits if exacto else None}",
+              repr(TOLERANCIA_POR_DEFECTO)]
+    for nombre, operacion in sorted(OPERACIONES.items()):
+        funciones = [
+            f"{getattr(f, '__module__', '')}.{getattr(f, '__qualname__', repr(f))}"
+            for f in (operacion.escalar, operacion.lote, operacion.costo)
+        ]
+        partes.append(f"{nombre}={operacion.codigo}:{funciones}:{operacion.tolerancia!r}")
+    return hashlib.blake2b("\n".join(partes).encode("utf-8"),
+                           digest_size=TAMANO_HUELLA_TRAMO).digest()
+
+
+def estado_guardado(fila: Sequence[str], columnas: Columnas) -> str:
+    """Estado de una fila (ya ajustada al encabezado) según los resultados escritos."""
+    if fila[columnas.computed_result] == "ERROR":
+        return "error"
+    return {"True": "correcta", "False": "incorrecta"}.get(
+        fila[columnas.is_correct], "sin_referencia"
+    )
+
+
+class IndiceIncremental:
+    """
+    Índice lateral de la última corrida incremental, en '<csv>.idx'.
+
+    Guarda cuántas filas se procesaron, hasta qué byte del CSV llegan, sus
+    totales y una huella de esos bytes, seguidos de la huella de cada fila.
+    Si el comienzo del CSV no cambió (lo habitual cuando solo se agregan
+    filas al final), ese tramo se copia en bloque sin leerlo fila a fila y
+    solo se procesan las filas nuevas. Si cambió, se recorre todo el archivo
+    y solo se recalculan las filas cuya huella no coincide con la de la
+    misma posición en el índice y que no tienen 'computed_result'.
+
+    'ajustes' es la huella_ajustes de esta corrida; si no coincide con la
+    del índice (por ejemplo, se pasó a modo exacto o cambió una
+    tolerancia) se recalcula todo el archivo.
+    """
+
+    def __init__(self, ruta_csv: str, ajustes: bytes = b"") -> None:
+        self.ruta_csv = ruta_csv
+        self.ruta = ruta_csv + ".idx"
+        self.ajustes = ajustes
+        self._f_anterior = None
+        self._f_nuevo = None
+        self._ruta_tmp = None
+        # Tramo ya procesado según el índice anterior
+        self._filas = self._bytes = self._correctas = self._errores = 0
+        self._huella = None
+        # Dónde empieza lo que esta corrida escribió y la huella hasta ahí
+        self._inicio = 0
+        self._huella_nueva = None
+
+    def __enter__(self) -> "IndiceIncremental":
+        try:
+            self._f_anterior = open(self.ruta, "rb")
+        except FileNotFoundError:
+            self._f_anterior = None
+        else:
+            cabecera = self._f_anterior.read(len(MAGIA_INDICE) + CABECERA_INDICE.size)
+            if (len(cabecera) == len(MAGIA_INDICE) + CABECERA_INDICE.size
+                    and cabecera.startswith(MAGIA_INDICE)):
+                (self._filas, self._bytes, self._correctas, self._errores,
+                 self._huella, ajustes) = CABECERA_INDICE.unpack_from(cabecera, len(MAGIA_INDICE))
+            if self._huella is None or ajustes != self._ajustes_cabecera():
+                # Formato desconocido u otros ajustes: se recalcula todo
+                self._filas = self._bytes = self._correctas = self._errores = 0
+                self._huella = None
+                self._f_anterior.close()
+                self._f_anterior = None
+
+        carpeta = os.path.dirname(os.path.abspath(self.ruta))
+        fd, self._ruta_tmp = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.ruta)}.", suffix=".tmp", dir=carpeta
+        )
+        self._f_nuevo = os.fdopen(fd, "wb")
+        # La cabecera se completa en confirmar
+        self._f_nuevo.write(MAGIA_INDICE + bytes(CABECERA_INDICE.size))
+        return self
+
+    def _ajustes_cabecera(self) -> bytes:
+        return self.ajustes.ljust(TAMANO_HUELLA_TRAMO, b"\x00")[:TAMANO_HUELLA_TRAMO]
+
+    def _huella_anterior(self) -> Optional[bytes]:
+        if self._f_anterior is None:
+            return None
+        huella = self._f_anterior.read(TAMANO_HUELLA)
+        return huella if len(huella) == TAMANO_HUELLA else None
+
+    def _copiar_procesado(self, f_in, f_out):
+        """
+        Copia a 'f_out' el tramo del CSV que ya se procesó, si no cambió.
+
+        Retorna la huella de lo copiado, o None (con 'f_in' y 'f_out' de
+        vuelta al comienzo) si no hay tramo procesado o cambió.
+        """
+        if self._huella is None or self._filas == 0:
+            return None
+        huella = hashlib.blake2b(digest_size=TAMANO_HUELLA_TRAMO)
+        copiados = _copiar_bytes(f_in, f_out, self._bytes, huella)
+        if copiados == self._bytes and huella.digest() == self._huella:
+            return huella
+        f_in.seek(0)
+        f_out.seek(0)
+        f_out.truncate()
+        return None
+
+    def procesar(self,
+                 calcular: Callable,
+                 resumen: Resumen,
+                 medir_lectura: Callable = iter,
+                 medir_escritura: Callable = iter) -> List[str]:
+        """
+        Reescribe el CSV copiando el tramo ya procesado y calculando el resto
+        con 'calcular' (self.calcular con las opciones de procesar_fila).
+
+        Retorna los encabezados de salida.
+        """
+        encabezados = []
+
+        def escribir(f_out) -> None:
+            with open(self.ruta_csv, "rb", buffering=TAMANO_BUFFER) as f_bin:
+                huella = self._copiar_procesado(f_bin, f_out)
+                f_in = io.TextIOWrapper(f_bin, encoding="utf-8", newline="")
+                if huella is None:
+                    self._huella_nueva = hashlib.blake2b(digest_size=TAMANO_HUELLA_TRAMO)
+                    fieldnames, columnas, filas = leer_filas(f_in)
+                else:
+                    # Las huellas de las filas copiadas pasan tal cual
+                    self._inicio = self._bytes
+                    self._huella_nueva = huella
+                    _copiar_bytes(self._f_anterior, self._f_nuevo, self._filas * TAMANO_HUELLA)
+                    resumen.sumar(self._filas, self._correctas, self._errores)
+                    resumen.omitidas += self._filas
+                    with open(self.ruta_csv, "r", newline="", encoding="utf-8") as f_encabezado:
+                        fieldnames, columnas, _ = leer_filas(f_encabezado)
+                    filas = filter(None, csv.reader(f_in))
+
+                f_texto = io.TextIOWrapper(f_out, encoding="utf-8", newline="")
+                escribir_filas(
+                    f_texto, fieldnames,
+                    medir_escritura(calcular(medir_lectura(filas), columnas, resumen)),
+                    encabezado=huella is None,
+                )
+                f_texto.flush()
+                f_texto.detach()
+                f_in.detach()
+            encabezados.extend(fieldnames)
+
+        escribir_atomico(self.ruta_csv, escribir, binario=True)
+        return encabezados
+
+    def calcular(self,
+                 filas: Iterable[List[str]],
+                 columnas: Columnas,
+                 resumen: Resumen,
+                 **opciones) -> Iterator[List[str]]:
+        """Como calcular_filas, pero omite las filas que no cambiaron."""
+        posiciones = [getattr(columnas, col) for col in COLUMNAS_ENTRADA]
+        for fila in filas:
+            huella = huella_fila(fila, posiciones)
+            if (huella == self._huella_anterior()
+                    and columnas.computed_result < len(fila)
+                    and fila[columnas.computed_result] != ""):
+                columnas.ajustar(fila)
+                resumen.registrar(estado_guardado(fila, columnas))
+                resumen.omitidas += 1
+            else:
+                resumen.registrar(procesar_fila(fila, columnas, **opciones))
+            self._f_nuevo.write(huella)
+            yield fila
+
+    def confirmar(self, resumen: Resumen) -> None:
+        """
+        Reemplaza el índice anterior por el nuevo. Se llama después de
+        escribir el CSV, con los totales del archivo completo.
+        """
+        with open(self.ruta_csv, "rb") as f_csv:
+            f_csv.seek(self._inicio)
+            tamano = self._inicio + _copiar_bytes(f_csv, None, sys.maxsize, self._huella_nueva)
+        self._f_nuevo.seek(len(MAGIA_INDICE))
+        self._f_nuevo.write(CABECERA_INDICE.pack(
+            resumen.total, tamano, resumen.correctas, resumen.errores,
+            self._huella_nueva.digest(), self._ajustes_cabecera(),
+        ))
+        self._f_nuevo.close()
+        # mkstemp crea el archivo con permisos 0600; usamos los del CSV
+        shutil.copymode(self.ruta_csv, self._ruta_tmp)
+        os.replace(self._ruta_tmp, self.ruta)
+        self._ruta_tmp = None
+
+    def __exit__(self, *exc) -> None:
+        if self._f_anterior is not None:
+            self._f_anterior.close()
+        self._f_nuevo.close()
+        if self._ruta_tmp is not None:
+            # No se confirmó: el índice anterior queda como estaba
+            os.remove(self._ruta_tmp)
+
+
+# ===================== CACHÉ DE RESULTADOS =====================
+
+# Versión del esquema de la tabla en disco (PRAGMA user_version)
+VERSION_CACHE = 2
+
+
+class CacheOperaciones:
+    """
+    Memoriza los resultados de calcular_operacion por (operación, op1, op2).
+
+    Mantiene una caché LRU en memoria de hasta 'tamano' entradas y,
+    opcionalmente, una tabla SQLite en 'ruta_disco' que persiste entre
+    corridas. Se usa como context manager para guardar la tabla al final.
+
+    Con exacto=True memoriza calcular_operacion_exacta; sus entradas se
+    guardan aparte de las del modo float aunque compartan el archivo.
+
+    Se puede compartir entre hilos (procesar_varios con hilos > 1, o el
+    pipeline asíncrono): la memoria y la tabla se usan bajo un candado y el
+    cálculo se hace fuera de él.
+    """
+
+    def __init__(self,
+                 tamano: int = 65536,
+                 ruta_disco: Optional[str] = None,
+                 exacto: bool = False,
+                 max_bits: float = MAX_BITS_EXACTOS) -> None:
+        self.tamano = tamano
+        self.exacto = exacto
+        self._memoria: "OrderedDict[tuple, Tuple[Optional[float], bool]]" = OrderedDict()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self._candado = threading.Lock()
+
+        if exacto:
+            self._operar = functools.partial(calcular_operacion_exacta, max_bits=max_bits)
+            self._sufijo = f"#exacto{max_bits}"
+        else:
+            self._operar = calcular_operacion
+            self._sufijo = ""
+
+        self._db = None
+        if ruta_disco is not None:
+            # Una sola conexión para todos los hilos, serializada con el candado
+            self._db = sqlite3.connect(ruta_disco, check_same_thread=False)
+            # Las versiones anteriores guardaban columnas REAL; como es una
+            # caché, esa tabla se descarta en lugar de convertirla
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version != VERSION_CACHE:
+                self._db.execute("DROP TABLE IF EXISTS resultados")
+                self._db.execute(f"PRAGMA user_version = {VERSION_CACHE}")
+            # Operandos y resultados se guardan como texto (repr) para no
+            # perder enteros grandes ni confundir 2 con 2.0
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resultados ("
+                " operacion TEXT, op1 TEXT, op2 TEXT, resultado TEXT, error INTEGER,"
+                " PRIMARY KEY (operacion, op1, op2))"
+            )
+
+    def calcular(self, operation: str, op1: float, op2: float) -> Tuple[Optional[float], bool]:
+        """Misma firma y resultado que calcular_operacion, pasando por la caché."""
+        operacion = buscar_operacion(operation)
+        if operacion is None:
+            # Operación desconocida: no vale la pena guardarla
+            return None, True
+
+        # Con los tipos en la clave, 2 y 2.0 no comparten entrada
+        clave = (operacion.codigo + self._sufijo, op1, op2, type(op1), type(op2))
+        with self._candado:
+            valor = self._memoria.get(clave)
+            if valor is not None:
+                self.aciertos += 1
+                self._memoria.move_to_end(clave)
+                return valor
+            valor = self._leer_disco(clave)
+            if valor is not None:
+                self.aciertos_disco += 1
+            else:
+                self.fallos += 1
+
+        # Dos hilos pueden calcular la misma clave a la vez; el resultado es
+        # el mismo, así que no hace falta retener el candado mientras tanto
+        if valor is None:
+            valor = self._operar(operation, op1, op2)
+            with self._candado:
+                self._escribir_disco(clave, valor)
+
+        with self._candado:
+            self._memoria[clave] = valor
+            if len(self._memoria) > self.tamano:
+                self._memoria.popitem(last=False)
+        return valor
+
+    def _leer_disco(self, clave: tuple) -> Optional[Tuple[Optional[float], bool]]:
+        if self._db is None:
+            return None
+        codigo, op1, op2 = clave[:3]
+        fila = self._db.execute(
+            "SELECT resultado, error FROM resultados"
+            " WHERE operacion = ? AND op1 = ? AND op2 = ?",
+            (codigo, repr(op1), repr(op2)),
+        ).fetchone()
+        if fila is None:
+            return None
+        texto, hubo_error = fila
+        if texto is None:
+            return None, bool(hubo_error)
+        # repr de un float siempre lleva '.', 'e', 'inf' o 'nan'
+        resultado = int(texto) if texto.lstrip("-").isdigit() else float(texto)
+        return resultado, bool(hubo_error)
+
+    def _escribir_disco(self, clave: tuple, valor: Tuple[Optional[float], bool]) -> None:
+        resultado, hubo_error = valor
+        # Solo se persisten resultados numéricos reales
+        if self._db is None or not (resultado is None or isinstance(resultado, (int, float))):
+            return
+        codigo, op1, op2 = clave[:3]
+        try:
+            fila = (codigo, repr(op1), repr(op2),
+                    None if resultado is None else repr(resultado), int(hubo_error))
+        except ValueError:
+            # Un entero más largo que el límite de dígitos no se puede guardar
+            # como texto; queda solo en la caché en memoria
+            return
+        self._db.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)", fila)
+
+    def imprimir_estadisticas(self) -> None:
+        """Muestra aciertos y fallos para dimensionar la caché."""
+        consultas = self.aciertos + self.aciertos_disco + self.fallos
+        tasa = 100 * (self.aciertos + self.aciertos_disco) / consultas if consultas else 0.0
+        print(f"Caché de operaciones: {self.aciertos} aciertos en memoria, "
+              f"{self.aciertos_disco} en disco, {self.fallos} fallos "
+              f"({tasa:.1f}% de aciertos, {len(self._memoria)}/{self.tamano} entradas)")
+
+    def cerrar(self) -> None:
+        """Guarda y cierra la tabla en disco, si la hay."""
+        with self._candado:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> "CacheOperaciones":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+# ===================== INSTRUMENTACIÓN =====================
+
+ETAPAS = ["lectura", "conversion", "calculo", "comparacion", "escritura"]
+
+
+def causa_error(operation: str, op1, op2, max_bits: Optional[float] = None) -> str:
+    """
+    Clasifica por qué falló una operación, repitiendo el cálculo para ver qué
+    excepción lanza. Solo se usa en filas con error y con instrumentación.
+    """
+    operacion = buscar_operacion(operation)
+    if operacion is None:
+        return "operacion_desconocida"
+    if (max_bits is not None and operacion.costo is not None
+            and isinstance(op1, int) and isinstance(op2, int)
+            and operacion.costo(op1, op2) > max_bits):
+        return "costo_excesivo"
+    try:
+        if not cabe_en_texto(operacion.escalar(op1, op2)):
+            return "costo_excesivo"
+    except ZeroDivisionError:
+        return "division_por_cero"
+    except OverflowError:
+        return "desbordamiento"
+    except ValueError:
+        return "fuera_de_dominio"
+    except Exception:
+        pass
+    return "otro"
+
+
+def _cubeta(ns: int) -> str:
+    """Cubeta del histograma de latencias: la potencia de 2 (en ns) que la acota."""
+    return f"<{1 << ns.bit_length()}ns"
+
+
+class Instrumentacion:
+    """
+    Mide dónde se va el tiempo al procesar un CSV por la ruta fila a fila.
+
+    Acumula el tiempo de cada etapa (lectura con csv.reader, conversión de
+    operandos, cálculo, comparación y escritura con csv.writer), un
+    histograma de latencias por operación y los errores por causa. Medir
+    cada llamada tiene un costo, así que solo se activa a pedido.
+    """
+
+    def __init__(self) -> None:
+        self.tiempos_ns: Dict[str, int] = {etapa: 0 for etapa in ETAPAS}
+        self.latencias: Dict[str, Counter] = defaultdict(Counter)
+        self.errores: Counter = Counter()
+        self.filas = 0
+        self._inicio: Optional[float] = None
+        self.segundos_total = 0.0
+
+    def iniciar(self) -> None:
+        self._inicio = time.perf_counter()
+
+    def terminar(self, filas: int) -> None:
+        self.filas += filas
+        self.segundos_total += time.perf_counter() - self._inicio
+
+    def agregar(self, otra: "Instrumentacion") -> None:
+        """Suma las mediciones de otro archivo (el tiempo total no se suma)."""
+        for etapa, ns in otra.tiempos_ns.items():
+            self.tiempos_ns[etapa] += ns
+        for codigo, histograma in otra.latencias.items():
+            self.latencias[codigo].update(histograma)
+        self.errores.update(otra.errores)
+
+    # --- envoltorios de cada etapa ---
+
+    def medir_lectura(self, filas: Iterable[List[str]]) -> Iterator[List[str]]:
+        """Entrega las mismas filas, midiendo cuánto tarda el lector en producirlas."""
+        filas = iter(filas)
+        while True:
+            t0 = time.perf_counter_ns()
+            fila = next(filas, None)
+            self.tiempos_ns["lectura"] += time.perf_counter_ns() - t0
+            if fila is None:
+                return
+            yield fila
+
+    def medir_escritura(self, filas: Iterable[List[str]]) -> Iterator[List[str]]:
+        """
+        Entrega las mismas filas al escritor; el tiempo hasta que pide la
+        siguiente es lo que tardó en escribir la anterior.
+        """
+        for fila in filas:
+            t0 = time.perf_counter_ns()
+            yield fila
+            self.tiempos_ns["escritura"] += time.perf_counter_ns() - t0
+
+    def _medir(self, funcion: Callable, etapa: str, causa: Optional[str] = None) -> Callable:
+        def medida(*args):
+            t0 = time.perf_counter_ns()
+            try:
+                return funcion(*args)
+            except ValueError:
+                if causa is not None:
+                    self.errores[causa] += 1
+                raise
+            finally:
+                self.tiempos_ns[etapa] += time.perf_counter_ns() - t0
+        return medida
+
+    def _medir_operar(self, operar: Callable, max_bits: Optional[float]) -> Callable:
+        def medida(operation, op1, op2):
+            t0 = time.perf_counter_ns()
+            resultado = operar(operation, op1, op2)
+            ns = time.perf_counter_ns() - t0
+            self.tiempos_ns["calculo"] += ns
+
+            operacion = buscar_operacion(operation)
+            codigo = operacion.codigo if operacion is not None else "DESCONOCIDA"
+            self.latencias[codigo][_cubeta(ns)] += 1
+            if resultado[1]:
+                self.errores[causa_error(operation, op1, op2, max_bits)] += 1
+            return resultado
+        return medida
+
+    def envolver_opciones(self, opciones: dict, max_bits: Optional[float] = None) -> dict:
+        """
+        Devuelve las opciones de procesar_fila con conversión, cálculo y
+        comparación medidos. 'max_bits' indica el tope del modo exacto.
+        """
+        exacto = opciones.get("exacto", False)
+        convertir = convertir_numero_exacto if exacto else convertir_numero
+        comparar = comparar_resultados_exacto if exacto else comparar_resultados
+        return {
+            **opciones,
+            "operar": self._medir_operar(opciones.get("operar", calcular_operacion), max_bits),
+            "convertir": self._medir(convertir, "conversion", causa="operando_invalido"),
+            "comparar": self._medir(comparar, "comparacion"),
+        }
+
+    # --- resultados ---
+
+    def como_dict(self) -> dict:
+        return {
+            "filas": self.filas,
+            "segundos_total": self.segundos_total,
+            "filas_por_segundo": self.filas / self.segundos_total if self.segundos_total else 0.0,
+            "segundos_por_etapa": {e: ns / 1e9 for e, ns in self.tiempos_ns.items()},
+            "latencia_por_operacion": {
+                codigo: dict(sorted(h.items(), key=lambda c: int(c[0][1:-2])))
+                for codigo, h in sorted(self.latencias.items())
+            },
+            "errores_por_causa": dict(self.errores.most_common()),
+        }
+
+    def guardar_json(self, ruta: str) -> None:
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, indent=2, ensure_ascii=False)
+
+
+def imprimir_resumen(resumen: Resumen, fieldnames: List[str], archivo=None) -> None:
+    """Muestra los totales del procesamiento (en 'archivo', por defecto stdout)."""
+    print("\nProcesamiento completado.", file=archivo)
+    print(f"Filas procesadas: {resumen.total}", file=archivo)
+    if "correct_result" in fieldnames:
+        print(f"Resultados correctos según 'correct_result': {resumen.correctas}",
+              file=archivo)
+    print(f"Operaciones con error (incluye división por cero): {resumen.errores}",
+          file=archivo)
+    if resumen.omitidas:
+        print(f"Filas sin cambios (no se recalcularon): {resumen.omitidas}", file=archivo)
+
+
+def _opciones_fila(exacto: bool,
+                   max_bits: float,
+                   cache: Optional[CacheOperaciones]) -> dict:
+    """Arma las opciones de procesar_fila para los modos exacto y con caché."""
+    opciones = {}
+    if exacto:
+        opciones["operar"] = functools.partial(calcular_operacion_exacta, max_bits=max_bits)
+        opciones["exacto"] = True
+    if cache is not None:
+        opciones["operar"] = cache.calcular
+    return opciones
+
+
+def procesar_flujo(f_in,
+                   f_out,
+                   vectorizado: bool = False,
+                   exacto: bool = False,
+                   max_bits: float = MAX_BITS_EXACTOS,
+                   instrumentacion: Optional[Instrumentacion] = None) -> Resumen:
+    """
+    Procesa un CSV desde un archivo abierto hacia otro (por ejemplo, stdin y
+    stdout), fila a fila y sin acumularlas.
+    """
+    if exacto and vectorizado:
+        raise ValueError("El modo exacto no se puede combinar con vectorizado.")
+    if instrumentacion is not None and vectorizado:
+        raise ValueError("La instrumentación solo está disponible en la ruta fila a fila.")
+
+    resumen = Resumen()
+    if vectorizado:
+        _requiere_numpy()
+        fieldnames, columnas, filas = leer_filas(f_in)
+        escribir_filas(f_out, fieldnames, calcular_lotes(filas, columnas, resumen))
+        return resumen
+
+    opciones = _opciones_fila(exacto, max_bits, None)
+    if instrumentacion is None:
+        fieldnames, columnas, filas = leer_filas(f_in)
+        escribir_filas(f_out, fieldnames, calcular_filas(filas, columnas, resumen, **opciones))
+        return resumen
+
+    opciones = instrumentacion.envolver_opciones(opciones, max_bits if exacto else None)
+    instrumentacion.iniciar()
+    fieldnames, columnas, filas = leer_filas(f_in)
+    procesadas = calcular_filas(
+        instrumentacion.medir_lectura(filas), columnas, resumen, **opciones
+    )
+    escribir_filas(f_out, fieldnames, instrumentacion.medir_escritura(procesadas))
+    instrumentacion.terminar(resumen.total)
+    return resumen
+
+
+def procesar_archivo_csv(ruta_csv: str,
+                         streaming: bool = False,
+                         vectorizado: bool = False,
+                         trabajadores: int = 1,
+                         incremental: bool = False,
+                         cache: Optional[CacheOperaciones] = None,
+                         exacto: bool = False,
+                         max_bits: float = MAX_BITS_EXACTOS,
+                         mostrar: bool = True,
+                         instrumentacion: Optional[Instrumentacion] = None,
+                         mapeado: bool = False,
+                         columnar: bool = False,
+                         asincrono: bool = False,
+                         discrepancias: bool = False) -> Optional[Resumen]:
+    """
+    Lee, procesa y sobrescribe el archivo CSV con los resultados.
+
+    Con mostrar=False no se imprime el resumen (útil al procesar muchos
+    archivos y mostrar solo el total).
+
+    Con streaming=True las filas pasan por el pipeline lectura → cálculo →
+    escritura de una en una hacia un archivo temporal, que reemplaza al
+    original al terminar. Así la memoria no crece con el tamaño del archivo.
+
+    Con vectorizado=True los cálculos se hacen por lotes de TAMANO_LOTE
+    filas con NumPy (ver calcular_operaciones_lote).
+
+    Con trabajadores > 1 el archivo se divide en rangos de bytes que se
+    procesan en paralelo con ProcessPoolExecutor (ver procesar_en_paralelo).
+
+    Con incremental=True solo se calculan las filas nuevas o modificadas
+    desde la corrida anterior (ver IndiceIncremental); si solo se agregaron
+    filas al final, el resto del archivo se copia sin procesarlo. Escribe
+    siempre en un temporal como streaming=True. Usa la ruta fila a fila,
+    así que no se combina con vectorizado, trabajadores > 1 ni asincrono.
+
+    Con una 'cache' (CacheOperaciones) cada operación pasa por la caché y al
+    final se muestran sus estadísticas. También requiere la ruta fila a fila.
+
+    Con exacto=True los operandos enteros se calculan con aritmética entera
+    exacta, rechazando como error los resultados de más de 'max_bits' bits
+    (ver calcular_operacion_exacta). No se combina con vectorizado.
+
+    Con una 'instrumentacion' se mide el tiempo de cada etapa, la latencia
+    por operación y los errores por causa (ver Instrumentacion). Requiere
+    la ruta fila a fila.
+
+    Con mapeado=True el archivo se lee con mmap y los operandos se
+    convierten directo desde los bytes a arreglos de NumPy, en memoria
+    constante (ver procesar_mapeado). Calcula con el motor vectorizado, así
+    que no se combina con exacto, incremental, caché, instrumentación ni
+    trabajadores > 1.
+
+    Con columnar=True, además del CSV, los operandos, las operaciones y los
+    resultados se guardan como columnas binarias en '<csv>.columnas/' (ver
+    EscritorColumnar y cargar_columnar). Requiere vectorizado o mapeado, sin
+    trabajadores > 1.
+
+    Con asincrono=True la lectura, el cálculo y la escritura corren a la
+    vez como etapas de asyncio con colas acotadas (ver pipeline_asincrono),
+    lo que ayuda cuando el disco es lento. Se combina con los modos de
+    cálculo, pero no con mapeado, instrumentación ni trabajadores > 1.
+
+    Con discrepancias=True las filas que no coinciden con correct_result se
+    anotan en '<csv>.discrepancias.tsv' (ver InformeDiscrepancias). Como la
+    salida columnar, requiere vectorizado o mapeado, sin trabajadores > 1.
+    """
+    if (incremental or cache is not None) and (vectorizado or trabajadores > 1):
+        raise ValueError(
+            "Los modos incremental y con caché no se pueden combinar "
+            "con vectorizado ni trabajadores > 1."
+        )
+    if exacto and vectorizado:
+        raise ValueError("El modo exacto no se puede combinar con vectorizado.")
+    if cache is not None and cache.exacto != exacto:
+        raise ValueError("La caché debe crearse con el mismo valor de 'exacto'.")
+    if instrumentacion is not None and (vectorizado or trabajadores > 1):
+        raise ValueError("La instrumentación solo está disponible en la ruta fila a fila.")
+    if mapeado and (exacto or incremental or cache is not None
+                    or instrumentacion is not None or trabajadores > 1):
+        raise ValueError(
+            "El lector mapeado solo se combina con el motor vectorizado."
+        )
+    if columnar and (not (vectorizado or mapeado) or trabajadores > 1):
+        raise ValueError(
+            "La salida columnar requiere vectorizado o mapeado, sin trabajadores > 1."
+        )
+    if discrepancias and (not (vectorizado or mapeado) or trabajadores > 1):
+        raise ValueError(
+            "El informe de discrepancias requiere vectorizado o mapeado, sin trabajadores > 1."
+        )
+    if asincrono and (mapeado or incremental or instrumentacion is not None or trabajadores > 1):
+        raise ValueError(
+            "El pipeline asíncrono no se combina con mapeado, incremental, "
+            "instrumentación ni trabajadores > 1."
+        )
+    if vectorizado or mapeado:
+        _requiere_numpy()
+    calcular = calcular_lotes if vectorizado else calcular_filas
+    resumen = Resumen()
+
+    # Opciones de la ruta fila a fila (ver procesar_fila)
+    opciones = _opciones_fila(exacto, max_bits, cache)
+
+    # Envoltorios de lectura y escritura: sin instrumentación no hacen nada
+    medir_lectura = medir_escritura = iter
+    if instrumentacion is not None:
+        opciones = instrumentacion.envolver_opciones(opciones, max_bits if exacto else None)
+        medir_lectura = instrumentacion.medir_lectura
+        medir_escritura = instrumentacion.medir_escritura
+        instrumentacion.iniciar()
+
+    with contextlib.ExitStack() as pila:
+        if incremental:
+            indice = pila.enter_context(
+                IndiceIncremental(ruta_csv, huella_ajustes(exacto, max_bits))
+            )
+            calcular = indice.calcular
+        if opciones:
+            calcular = functools.partial(calcular, **opciones)
+        destino = informe = None
+        if columnar:
+            destino = pila.enter_context(EscritorColumnar(ruta_csv))
+        if discrepancias:
+            informe = pila.enter_context(InformeDiscrepancias(ruta_csv))
+        if columnar or discrepancias:
+            calcular = functools.partial(calcular_lotes, destino=destino, informe=informe)
+
+        if mapeado:
+            try:
+                fieldnames = procesar_mapeado(ruta_csv, resumen, destino, informe)
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+        elif trabajadores > 1:
+            try:
+                fieldnames = procesar_en_paralelo(
+                    ruta_csv, trabajadores, vectorizado, resumen, opciones
+                )
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+        elif incremental:
+            try:
+                fieldnames = indice.procesar(calcular, resumen, medir_lectura, medir_escritura)
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+        elif asincrono:
+            try:
+                f_in = open(ruta_csv, "r", newline="", encoding="utf-8",
+                            buffering=TAMANO_BUFFER)
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+
+            with f_in:
+                fieldnames, columnas, filas = leer_filas(f_in)
+                escribir_atomico(
+                    ruta_csv,
+                    lambda f_out: asyncio.run(pipeline_asincrono(
+                        filas, columnas, calcular, resumen, f_out, fieldnames
+                    )),
+                )
+        elif streaming:
+            try:
+                f_in = open(ruta_csv, "r", newline="", encoding="utf-8",
+                            buffering=TAMANO_BUFFER)
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+
+            with f_in:
+                fieldnames, columnas, filas = leer_filas(f_in)
+                escribir_atomico(
+                    ruta_csv,
+                    lambda f_out: escribir_filas(
+                        f_out, fieldnames,
+                        medir_escritura(calcular(medir_lectura(filas), columnas, resumen)),
+                    ),
+                )
+        else:
+            try:
+                with open(ruta_csv, "r", newline="", encoding="utf-8",
+                          buffering=TAMANO_BUFFER) as f_in:
+                    fieldnames, columnas, filas = leer_filas(f_in)
+                    procesadas = list(calcular(medir_lectura(filas), columnas, resumen))
+            except FileNotFoundError:
+                print(f"[ERROR] No se encontró el archivo: {ruta_csv}")
+                return None
+
+            # Escribimos de nuevo el archivo con resultados; si la escritura
+            # falla, el CSV original queda intacto
+            escribir_atomico(
+                ruta_csv,
+                lambda f_out: escribir_filas(f_out, fieldnames, medir_escritura(procesadas)),
+            )
+
+        if incremental:
+            indice.confirmar(resumen)
+        if columnar:
+            destino.confirmar()
+        if discrepancias:
+            informe.confirmar()
+
+    if instrumentacion is not None:
+        instrumentacion.terminar(resumen.total)
+
+    if mostrar:
+        imprimir_resumen(resumen, fieldnames)
+        if cache is not None:
+            cache.imprimir_estadisticas()
+        if discrepancias:
+            print(f"Discrepancias con correct_result: {informe.discrepancias} "
+                  f"(detalle en '{informe.ruta}')")
+    return resumen
+
+
+# ===================== MODO POR LOTES (LÍNEA DE COMANDOS) =====================
+
+def expandir_rutas(patrones: Sequence[str]) -> List[str]:
+    """
+    Convierte rutas, patrones glob y carpetas en la lista de archivos CSV a
+    procesar, sin repetidos y en el orden dado. '-' se mantiene tal cual.
+    """
+    rutas = []
+    for patron in patrones:
+        if patron == "-":
+            encontradas = ["-"]
+        elif os.path.isdir(patron):
+            encontradas = sorted(glob.glob(os.path.join(patron, "*.csv")))
+        elif glob.has_magic(patron):
+            encontradas = sorted(glob.glob(patron, recursive=True))
+        else:
+            encontradas = [patron]
+        rutas.extend(encontradas)
+    return list(dict.fromkeys(rutas))
+
+
+def procesar_varios(rutas: Sequence[str],
+                    hilos: int = 4,
+                    instrumentacion: Optional[Instrumentacion] = None,
+                    **opciones) -> Tuple[Resumen, int]:
+    """
+    Procesa varios archivos CSV a la vez con un pool de hilos acotado, para
+    solapar la lectura y escritura de un archivo con el cálculo de otro.
+    Con hilos=1 se procesan en orden en el hilo principal.
+
+    'opciones' se pasan a procesar_archivo_csv. Con 'instrumentacion' cada
+    archivo se mide por separado y las mediciones se suman en ella. Retorna
+    el resumen combinado y la cantidad de archivos que fallaron.
+    """
+    total = Resumen()
+    fallidos = 0
+
+    def procesar(ruta: str) -> Tuple[Optional[Resumen], Optional[Instrumentacion]]:
+        propia = Instrumentacion() if instrumentacion is not None else None
+        try:
+            resumen = procesar_archivo_csv(
+                ruta, mostrar=False, instrumentacion=propia, **opciones
+            )
+            return resumen, propia
+        except Exception as exc:
+            print(f"[ERROR] {ruta}: {exc}", file=sys.stderr)
+            return None, None
+
+    if instrumentacion is not None:
+        instrumentacion.iniciar()
+
+    with contextlib.ExitStack() as pila:
+        if hilos > 1:
+            ejecutor = pila.enter_context(ThreadPoolExecutor(max_workers=hilos))
+            resultados = ejecutor.map(procesar, rutas)
+        else:
+            resultados = map(procesar, rutas)
+
+        for resumen, propia in resultados:
+            if resumen is None:
+                fallidos += 1
+                continue
+            total.agregar(resumen)
+            if propia is not None:
+                instrumentacion.agregar(propia)
+
+    if instrumentacion is not None:
+        instrumentacion.terminar(total.total)
+    return total, fallidos
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Calcula las operaciones de uno o varios archivos CSV y "
+                    "agrega las columnas computed_result e is_correct.",
+    )
+    parser.add_argument(
+        "rutas", nargs="*",
+        help="archivos, carpetas o patrones glob; '-' lee de stdin y escribe en stdout",
+    )
+    parser.add_argument("--hilos", type=int, default=4,
+                        help="archivos procesados a la vez (por defecto 4)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="procesa cada archivo en memoria constante")
+    parser.add_argument("--vectorizado", action="store_true",
+                        help="calcula por lotes con NumPy")
+    parser.add_argument("--mapeado", action="store_true",
+                        help="lee con mmap y calcula por lotes con NumPy")
+    parser.add_argument("--columnar", action="store_true",
+                        help="guarda también los resultados como columnas "
+                             "binarias en <csv>.columnas/")
+    parser.add_argument("--asincrono", action="store_true",
+                        help="lee, calcula y escribe a la vez (útil con discos lentos)")
+    parser.add_argument("--discrepancias", action="store_true",
+                        help="anota las filas que no coinciden con correct_result "
+                             "en <csv>.discrepancias.tsv")
+    parser.add_argument("--tolerancia", metavar="[OP=]REL,ABS[,ULPS]", action="append",
+                        type=leer_tolerancia, default=[],
+                        help="tolerancia de comparación, por defecto o de una operación "
+                             "(se puede repetir)")
+    parser.add_argument("--trabajadores", type=int, default=1,
+                        help="procesos por archivo (por defecto 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="solo recalcula filas nuevas o modificadas")
+    parser.add_argument("--exacto", action="store_true",
+                        help="aritmética entera exacta para operandos enteros")
+    parser.add_argument("--max-bits", type=float, default=MAX_BITS_EXACTOS,
+                        help="tope de bits de un resultado en modo exacto")
+    parser.add_argument("--cache", action="store_true",
+                        help="memoriza los resultados de operaciones repetidas")
+    parser.add_argument("--cache-tamano", type=int, default=65536, metavar="N",
+                        help="entradas de la caché en memoria (por defecto 65536)")
+    parser.add_argument("--cache-disco", metavar="RUTA_SQLITE",
+                        help="guarda la caché en una tabla SQLite entre corridas "
+                             "(implica --cache)")
+    parser.add_argument("--metricas", metavar="RUTA_JSON",
+                        help="guarda tiempos por etapa, latencias y errores en JSON")
+    parser.add_argument("--perfil", metavar="RUTA_PROF",
+                        help="ejecuta con cProfile y guarda las estadísticas "
+                             "(procesa los archivos de a uno)")
+    return parser
+
+
+def validar_argumentos(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Rechaza con parser.error las combinaciones de opciones que no se pueden
+    atender, antes de procesar ningún archivo. Son las mismas que rechazan
+    procesar_archivo_csv y procesar_flujo.
+    """
+    por_lotes = args.vectorizado or args.mapeado
+    paralelo = args.trabajadores > 1
+    cache = args.cache or args.cache_disco is not None
+
+    if "-" in args.rutas:
+        if len(args.rutas) > 1:
+            parser.error("'-' no se puede combinar con otras rutas")
+        ignoradas = [opcion for opcion, activa in (
+            ("--streaming", args.streaming),
+            ("--asincrono", args.asincrono),
+            ("--incremental", args.incremental),
+            ("--cache", cache),
+            ("--trabajadores", paralelo),
+            ("--columnar", args.columnar),
+            ("--discrepancias", args.discrepancias),
+        ) if activa]
+        if ignoradas:
+            parser.error(f"con '-' (stdin) no se puede usar {', '.join(ignoradas)}")
+
+    if args.max_bits > max_bits_texto():
+        parser.error(f"--max-bits no puede superar {max_bits_texto()}: un resultado más "
+                     "grande no se puede escribir como texto (ver sys.set_int_max_str_digits)")
+    if args.exacto and por_lotes:
+        parser.error("--exacto no se puede combinar con --vectorizado ni --mapeado")
+    if args.metricas and (por_lotes or paralelo):
+        parser.error("--metricas solo está disponible en la ruta fila a fila "
+                     "(sin --vectorizado, --mapeado ni --trabajadores)")
+    if args.incremental and (por_lotes or paralelo):
+        parser.error("--incremental no se puede combinar con --vectorizado, "
+                     "--mapeado ni --trabajadores")
+    if cache and (por_lotes or paralelo):
+        parser.error("--cache no se puede combinar con --vectorizado, "
+                     "--mapeado ni --trabajadores")
+    if args.cache_tamano < 1:
+        parser.error("--cache-tamano debe ser al menos 1")
+    if args.mapeado and paralelo:
+        parser.error("--mapeado no se puede combinar con --trabajadores")
+    if (args.columnar or args.discrepancias) and (not por_lotes or paralelo):
+        parser.error("--columnar y --discrepancias requieren --vectorizado o --mapeado, "
+                     "sin --trabajadores")
+    if args.asincrono and (args.mapeado or args.incremental or args.metricas or paralelo):
+        parser.error("--asincrono no se puede combinar con --mapeado, --incremental, "
+                     "--metricas ni --trabajadores")
+
+
+def _ejecutar(args: argparse.Namespace,
+              instrumentacion: Optional[Instrumentacion]) -> int:
+    """Procesa las rutas de la línea de comandos y muestra el resumen."""
+    rutas = expandir_rutas(args.rutas)
+    if "-" in rutas:
+        resumen = procesar_flujo(
+            sys.stdin, sys.stdout,
+            # stdin no se puede mapear: --mapeado usa el lector por lotes
+            vectorizado=args.vectorizado or args.mapeado,
+            exacto=args.exacto, max_bits=args.max_bits,
+            instrumentacion=instrumentacion,
+        )
+        # stdout lleva los datos, así que el resumen va a stderr
+        imprimir_resumen(resumen, ["correct_result"], archivo=sys.stderr)
+        return 0
+
+    with contextlib.ExitStack() as pila:
+        cache = None
+        if args.cache or args.cache_disco is not None:
+            # Una sola caché compartida por todos los archivos e hilos
+            cache = pila.enter_context(CacheOperaciones(
+                args.cache_tamano, args.cache_disco,
+                exacto=args.exacto, max_bits=args.max_bits,
+            ))
+        resumen, fallidos = procesar_varios(
+            rutas,
+            # cProfile solo ve el hilo principal
+            hilos=1 if args.perfil else args.hilos,
+            instrumentacion=instrumentacion,
+            streaming=args.streaming,
+            vectorizado=args.vectorizado,
+            mapeado=args.mapeado,
+            columnar=args.columnar,
+            asincrono=args.asincrono,
+            discrepancias=args.discrepancias,
+            trabajadores=args.trabajadores,
+            incremental=args.incremental,
+            cache=cache,
+            exacto=args.exacto,
+            max_bits=args.max_bits,
+        )
+        print(f"\nArchivos procesados: {len(rutas) - fallidos} de {len(rutas)}")
+        imprimir_resumen(resumen, ["correct_result"])
+        if cache is not None:
+            cache.imprimir_estadisticas()
+    return 1 if fallidos else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    validar_argumentos(parser, args)
+
+    if not args.rutas:
+        # Sin argumentos se mantiene el modo interactivo
+        ruta = leer_ruta_csv()
+        procesar_archivo_csv(ruta)
+        return 0
+
+    try:
+        for codigo, tolerancia in args.tolerancia:
+            configurar_tolerancia(tolerancia, codigo)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 2
+
+    instrumentacion = Instrumentacion() if args.metricas else None
+    perfil = cProfile.Profile() if args.perfil else None
+    if perfil is not None:
+        perfil.enable()
+    try:
+        codigo = _ejecutar(args, instrumentacion)
+    finally:
+        if perfil is not None:
+            perfil.disable()
+            perfil.dump_stats(args.perfil)
 
-def main() -> None:
-    ruta = leer_ruta_csv()
-    procesar_archivo_csv(ruta)
+    if instrumentacion is not None:
+        instrumentacion.guardar_json(args.metricas)
+    return codigo
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
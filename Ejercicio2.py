@@ -12,7 +12,14 @@ Se usan estas columnas del CSV:
 - speed
 """
 
+import functools
 import os
+import shutil
+import tempfile
+import zipfile
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Union
+
+import numpy as np
 import pandas as pd
 
 # Carpeta donde está este script (Ejercicio2.py)
@@ -21,61 +28,699 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Ruta por defecto al CSV: OG/data/pokemon.csv (relativa a la ubicación del script)
 DEFAULT_CSV_PATH = os.path.join(BASE_DIR, "OG", "data", "pokemon.csv")
 
+# Columnas del CSV que usa el juego
+COLUMNAS = ["name", "type_1", "hp", "attack", "defense", "speed"]
+COLUMNAS_TEXTO = ["name", "type_1"]
+COLUMNAS_ESTADISTICAS = ["hp", "attack", "defense", "speed"]
+
+# Las estadísticas de pokemon.csv caben de sobra en int16; si alguna columna
+# trae valores fuera de rango se deja en int64
+TIPO_ESTADISTICA = np.int16
+
+# Versión del formato del snapshot binario; cambiarla invalida los anteriores
+VERSION_SNAPSHOT = 1
+
+# Capacidad mínima de los arreglos del plantel y cantidad mínima de borrados
+# antes de compactar; por encima de esto se espera a que igualen una fracción
+# del plantel, así el costo de cada copia se reparte (amortizado O(1)).
+MINIMO_PENDIENTES = 1024
+
+
+# ===================== CARGA RÁPIDA =====================
+
+class ColumnaFaltante(KeyError):
+    """El CSV no tiene una de las columnas requeridas."""
+
+
+def _tipo_compacto(valores: pd.Series):
+    """TIPO_ESTADISTICA si todos los valores caben en él; si no, int64."""
+    info = np.iinfo(TIPO_ESTADISTICA)
+    if len(valores) == 0 or (valores.min() >= info.min and valores.max() <= info.max):
+        return TIPO_ESTADISTICA
+    return np.int64
+
+
+def _compactar_estadisticas(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({col: _tipo_compacto(df[col]) for col in COLUMNAS_ESTADISTICAS})
+
+
+def leer_csv_pokemon(ruta: str) -> pd.DataFrame:
+    """Lee solo las columnas del juego, con tipos compactos, en una pasada.
+
+    Las estadísticas se leen directamente como enteros; si alguna fila trae un
+    valor vacío o no entero se repite la lectura convirtiendo con
+    pd.to_numeric y se descartan esas filas, como antes.
+    Lanza FileNotFoundError o ColumnaFaltante.
+    """
+    encabezado = pd.read_csv(ruta, nrows=0).columns
+    for col in COLUMNAS:
+        if col not in encabezado:
+            raise ColumnaFaltante(col)
+
+    tipos = {col: np.int64 for col in COLUMNAS_ESTADISTICAS}
+    try:
+        df = pd.read_csv(ruta, usecols=COLUMNAS, dtype=tipos)
+    except (ValueError, OverflowError):
+        df = pd.read_csv(ruta, usecols=COLUMNAS)
+        for col in COLUMNAS_ESTADISTICAS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        # Eliminar filas con datos numéricos inválidos
+        df = df.dropna(subset=COLUMNAS_ESTADISTICAS)
+        df = df.astype({col: np.int64 for col in COLUMNAS_ESTADISTICAS})
+
+    # usecols conserva el orden del archivo; se reordena al del juego
+    return _compactar_estadisticas(df[COLUMNAS].reset_index(drop=True))
+
+
+def ruta_snapshot(ruta: str) -> str:
+    """Archivo del snapshot binario de un CSV: <csv>.snapshot.npz"""
+    return ruta + ".snapshot.npz"
+
+
+def _clave_snapshot(ruta: str) -> dict:
+    """Identifica la versión del CSV: ruta absoluta, fecha de modificación y tamaño."""
+    info = os.stat(ruta)
+    return {
+        "version": VERSION_SNAPSHOT,
+        "ruta": os.path.abspath(ruta),
+        "mtime_ns": info.st_mtime_ns,
+        "tamano": info.st_size,
+    }
+
+
+def cargar_snapshot(ruta: str) -> Optional[pd.DataFrame]:
+    """Devuelve el DataFrame guardado para 'ruta', o None si no hay o quedó viejo."""
+    try:
+        clave = _clave_snapshot(ruta)
+        with np.load(ruta_snapshot(ruta), allow_pickle=False) as datos:
+            if any(datos[campo].item() != valor for campo, valor in clave.items()):
+                return None
+            columnas = {}
+            for col in COLUMNAS_TEXTO:
+                # Los textos vacíos del CSV (NaN) se guardan aparte como máscara
+                columnas[col] = pd.Series(datos[col]).where(~datos[col + "_nulo"])
+            for col in COLUMNAS_ESTADISTICAS:
+                columnas[col] = datos[col]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    return pd.DataFrame(columnas, columns=COLUMNAS)
+
+
+def guardar_snapshot(ruta: str, df: pd.DataFrame) -> None:
+    """Guarda df como snapshot binario de 'ruta' (si no se puede escribir, se omite)."""
+    arreglos = {campo: np.array(valor) for campo, valor in _clave_snapshot(ruta).items()}
+    for col in COLUMNAS_TEXTO:
+        nulos = df[col].isna().to_numpy()
+        arreglos[col] = np.array(df[col].where(~nulos, "").tolist(), dtype=str)
+        arreglos[col + "_nulo"] = nulos
+    for col in COLUMNAS_ESTADISTICAS:
+        arreglos[col] = df[col].to_numpy()
+
+    destino = ruta_snapshot(ruta)
+    try:
+        # Se escribe en un temporal propio y se reemplaza, así no queda un
+        # snapshot a medias ni se pisa el de otra instancia que carga a la vez
+        fd, temporal = tempfile.mkstemp(
+            prefix=f".{os.path.basename(destino)}.", suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(destino)),
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arreglos)
+        # mkstemp crea el archivo con permisos 0600; usamos los del CSV
+        shutil.copymode(ruta, temporal)
+        os.replace(temporal, destino)
+    except OSError:
+        os.remove(temporal)
+
+
+def leer_pokemon(ruta: str, snapshot: bool = True) -> pd.DataFrame:
+    """Lee el CSV de pokémons usando el snapshot binario si está al día."""
+    if snapshot:
+        df = cargar_snapshot(ruta)
+        if df is not None:
+            return df
+    df = leer_csv_pokemon(ruta)
+    if snapshot:
+        guardar_snapshot(ruta, df)
+    return df
+
+
+# ===================== PLANTEL =====================
+
+class Categorias:
+    """Categorías de una columna de texto con pocos valores distintos (type_1).
+
+    Las filas guardan el código de su categoría (posición en la lista); -1
+    representa un valor vacío (NaN en el CSV).
+    """
+
+    def __init__(self) -> None:
+        self.textos: List[str] = []
+        self._codigos: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.textos)
+
+    def codigo(self, texto) -> int:
+        """Código de 'texto', agregándolo como categoría nueva si hace falta."""
+        if not isinstance(texto, str):
+            return -1
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = len(self.textos)
+            self.textos.append(texto)
+            self._codigos[texto] = codigo
+        return codigo
+
+    def codificar(self, valores: pd.Series) -> np.ndarray:
+        """Códigos de una columna entera, en una pasada vectorizada."""
+        codigos, unicos = pd.factorize(valores)
+        traduccion = np.array([self.codigo(texto) for texto in unicos] + [-1], dtype=np.int64)
+        return traduccion[codigos]
+
+    def texto(self, codigo: int):
+        return self.textos[codigo] if codigo >= 0 else np.nan
+
+    def decodificar(self, codigos: np.ndarray) -> np.ndarray:
+        """Arreglo de textos (object) para un arreglo de códigos."""
+        # El elemento extra al final atiende el código -1
+        return np.array(self.textos + [np.nan], dtype=object)[codigos]
+
+
+class TablaTextos:
+    """Tabla de textos en un solo buffer UTF-8 más un arreglo de inicios.
+
+    El texto de código c ocupa datos[inicios[c]:inicios[c + 1]], así que un
+    millón de nombres son un bloque de bytes y un arreglo int64, en lugar de un
+    millón de objetos str. Las filas guardan el código; -1 es un valor vacío.
+    La tabla no busca duplicados: quien agrega decide si reutilizar un código.
+    """
+
+    def __init__(self) -> None:
+        self._datos = bytearray()
+        self._inicios = np.zeros(MINIMO_PENDIENTES + 1, dtype=np.int64)
+        self._cantidad = 0
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def nbytes(self) -> int:
+        return len(self._datos) + self._inicios.nbytes
+
+    def agregar(self, texto: str) -> int:
+        """Agrega 'texto' al final de la tabla y devuelve su código."""
+        if self._cantidad + 1 == len(self._inicios):
+            self._inicios = np.concatenate([self._inicios, np.zeros_like(self._inicios)])
+        self._datos += texto.encode("utf-8")
+        self._cantidad += 1
+        self._inicios[self._cantidad] = len(self._datos)
+        return self._cantidad - 1
+
+    def codificar(self, valores: pd.Series) -> np.ndarray:
+        """Agrega los textos distintos de una columna y devuelve sus códigos."""
+        codigos, unicos = pd.factorize(valores)
+        codificados = [texto.encode("utf-8") for texto in unicos.tolist()]
+        largos = np.fromiter(map(len, codificados), dtype=np.int64, count=len(codificados))
+        base = self._cantidad
+        inicios = self._inicios[:base + 1]
+        self._inicios = np.concatenate([inicios, inicios[-1] + np.cumsum(largos)])
+        self._datos += b"".join(codificados)
+        self._cantidad += len(codificados)
+        return np.where(codigos >= 0, codigos + base, -1)
+
+    def texto(self, codigo: int):
+        if codigo < 0:
+            return np.nan
+        inicio, fin = self._inicios[codigo:codigo + 2].tolist()
+        return self._datos[inicio:fin].decode("utf-8")
+
+    def textos(self) -> List[str]:
+        """Todos los textos de la tabla, en orden de código."""
+        return self.decodificar(np.arange(self._cantidad)).tolist()
+
+    def decodificar(self, codigos: np.ndarray) -> np.ndarray:
+        """Arreglo de textos (object) para un arreglo de códigos."""
+        datos = bytes(self._datos)
+        inicios = self._inicios[codigos].tolist()
+        fines = self._inicios[codigos + 1].tolist()
+        resultado = np.array([datos[i:f].decode("utf-8") for i, f in zip(inicios, fines)],
+                             dtype=object)
+        resultado[codigos < 0] = np.nan
+        return resultado
+
+    def reducir(self, codigos: np.ndarray) -> np.ndarray:
+        """Deja en la tabla solo los textos usados por 'codigos' y los recodifica."""
+        usados = codigos >= 0
+        conservados, nuevos = np.unique(codigos[usados], return_inverse=True)
+        inicios = self._inicios[conservados]
+        largos = self._inicios[conservados + 1] - inicios
+        nuevos_inicios = np.concatenate([[0], np.cumsum(largos)])
+        # Posición en el buffer viejo de cada byte que se conserva
+        origen = np.repeat(inicios - nuevos_inicios[:-1], largos) + np.arange(nuevos_inicios[-1])
+        self._datos = bytearray(np.frombuffer(self._datos, dtype=np.uint8)[origen].tobytes())
+        self._inicios = nuevos_inicios
+        self._cantidad = len(conservados)
+        codigos = codigos.copy()
+        codigos[usados] = nuevos
+        return codigos
+
+
+@functools.lru_cache(maxsize=None)
+def _rango_entero(tipo: np.dtype) -> tuple:
+    """(mínimo, máximo) de un tipo entero; np.iinfo es lento para llamarlo por fila."""
+    info = np.iinfo(tipo)
+    return int(info.min), int(info.max)
+
+
+class Plantel:
+    """Almacén compacto de pokémons como estructura de arreglos NumPy.
+
+    Cada columna es un arreglo: las estadísticas en int16 (int64 si algún
+    valor no cabe), 'type_1' como código de categoría (int16) y 'name' como
+    código (int32) en una tabla de textos internados. Los arreglos crecen
+    duplicando su capacidad, así que agregar es O(1) amortizado.
+
+    Cada fila tiene un id estable. Borrar solo la marca como muerta (lápida);
+    los arreglos se compactan en lote cuando las lápidas llegan a la mitad.
+    Los ids quedan ordenados, así que se ubican con búsqueda binaria.
+    """
+
+    # Tipo inicial de cada arreglo; los de códigos y estadísticas se amplían si hace falta
+    TIPOS = {
+        "id": np.int64,
+        "vivo": np.bool_,
+        "name": np.int32,
+        "type_1": np.int16,
+        **{col: TIPO_ESTADISTICA for col in COLUMNAS_ESTADISTICAS},
+    }
+
+    def __init__(self, df: Optional[pd.DataFrame] = None) -> None:
+        self._nombres = TablaTextos()
+        self._tipos = Categorias()
+        # Filas ocupadas en los arreglos (vivas y borradas) y cuántas están borradas
+        self._usadas = 0
+        self._borradas = 0
+        self._siguiente_id = 0
+        self._arreglos: Dict[str, np.ndarray] = {
+            col: np.empty(0, dtype=tipo) for col, tipo in self.TIPOS.items()
+        }
+        # Nombre -> su código en la tabla de nombres, para no repetir textos.
+        # Está en orden de código (los nuevos van al final) y se arma recién
+        # con la primera alta o cambio de nombre: leer no lo necesita.
+        self._codigos_nombres: Optional[Dict[str, int]] = None
+        # Nombre normalizado (casefold) -> id de la fila con ese nombre, o
+        # conjunto de ids si hay varias (la mayoría de los nombres son únicos
+        # y un int ocupa mucho menos que un conjunto)
+        self._indice_nombres: Dict[str, Union[int, Set[int]]] = {}
+        if df is not None and len(df):
+            self._cargar(df)
+        self._reconstruir_indice()
+
+    def _cargar(self, df: pd.DataFrame) -> None:
+        """Llena los arreglos desde un DataFrame de una sola vez."""
+        n = len(df)
+        columnas = {
+            "id": np.arange(n, dtype=np.int64),
+            "vivo": np.ones(n, dtype=np.bool_),
+            "name": self._nombres.codificar(df["name"]),
+            "type_1": self._tipos.codificar(df["type_1"]),
+        }
+        for col in COLUMNAS_ESTADISTICAS:
+            columnas[col] = df[col].to_numpy(dtype=np.int64)
+        for col, valores in columnas.items():
+            self._arreglos[col] = valores.astype(self._tipo_para(col, valores))
+        self._usadas = n
+        self._siguiente_id = n
+
+    def __len__(self) -> int:
+        return self._usadas - self._borradas
+
+    def __contains__(self, id_fila: int) -> bool:
+        return self._posicion(id_fila) is not None
+
+    def nbytes(self) -> int:
+        """Memoria de los arreglos y la tabla de nombres (capacidad incluida)."""
+        return sum(arreglo.nbytes for arreglo in self._arreglos.values()) + self._nombres.nbytes()
+
+    # ---------- acceso por id ----------
+
+    def _posicion(self, id_fila: int) -> Optional[int]:
+        """Posición de una fila viva en los arreglos, o None."""
+        ids = self._arreglos["id"][:self._usadas]
+        posicion = int(np.searchsorted(ids, id_fila))
+        if posicion < self._usadas and ids[posicion] == id_fila and self._arreglos["vivo"][posicion]:
+            return posicion
+        return None
+
+    def _posicion_o_error(self, id_fila: int) -> int:
+        posicion = self._posicion(id_fila)
+        if posicion is None:
+            raise KeyError(id_fila)
+        return posicion
+
+    def _marco(self, posiciones: np.ndarray) -> pd.DataFrame:
+        """DataFrame (índice = id) con las filas de esas posiciones."""
+        a = self._arreglos
+        datos = {
+            "name": self._nombres.decodificar(a["name"][posiciones]),
+            "type_1": self._tipos.decodificar(a["type_1"][posiciones]),
+        }
+        for col in COLUMNAS_ESTADISTICAS:
+            datos[col] = a[col][posiciones]
+        return pd.DataFrame(datos, index=a["id"][posiciones], columns=COLUMNAS)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Copia de las filas vivas como DataFrame (índice = id de fila).
+
+        Se arma en cada acceso, así que escribir en ella no cambia el
+        plantel: para eso están agregar, actualizar y eliminar.
+        """
+        return self._marco(np.flatnonzero(self._arreglos["vivo"][:self._usadas]))
+
+    def primeras(self, cantidad: int) -> pd.DataFrame:
+        """Las primeras 'cantidad' filas vivas, sin armar el DataFrame completo."""
+        vivas = np.flatnonzero(self._arreglos["vivo"][:self._usadas])
+        return self._marco(vivas[:cantidad])
+
+    # ---------- índice de nombres ----------
+
+    @staticmethod
+    def _clave_nombre(nombre: str) -> str:
+        """Forma normalizada de un nombre para compararlo sin importar mayúsculas."""
+        clave = nombre.casefold()
+        # Si no cambió se usa el mismo objeto, que ya está en la tabla de nombres
+        return nombre if clave == nombre else clave
+
+    def _reconstruir_indice(self) -> None:
+        """Recorre los códigos de nombre una vez y arma el índice de nombres."""
+        claves = [self._clave_nombre(nombre) for nombre in (
+            self._nombres.textos() if self._codigos_nombres is None else self._codigos_nombres
+        )]
+        vivas = self._arreglos["vivo"][:self._usadas]
+        ids = self._arreglos["id"][:self._usadas][vivas].tolist()
+        codigos = self._arreglos["name"][:self._usadas][vivas].tolist()
+        self._indice_nombres = {}
+        for id_fila, codigo in zip(ids, codigos):
+            # Los nombres vacíos del CSV no se pueden buscar
+            if codigo >= 0:
+                self._indexar_clave(claves[codigo], id_fila)
+
+    def _indexar_clave(self, clave: str, id_fila: int) -> None:
+        actual = self._indice_nombres.get(clave)
+        if actual is None:
+            self._indice_nombres[clave] = id_fila
+        elif isinstance(actual, set):
+            actual.add(id_fila)
+        else:
+            self._indice_nombres[clave] = {actual, id_fila}
+
+    def _indexar(self, nombre: str, id_fila: int) -> None:
+        """Agrega una fila al índice de nombres."""
+        self._indexar_clave(self._clave_nombre(nombre), id_fila)
+
+    def _desindexar(self, nombre, id_fila: int) -> None:
+        """Quita una fila del índice de nombres."""
+        if not isinstance(nombre, str):
+            return
+        clave = self._clave_nombre(nombre)
+        actual = self._indice_nombres.get(clave)
+        if isinstance(actual, set):
+            actual.discard(id_fila)
+            if len(actual) == 1:
+                self._indice_nombres[clave] = actual.pop()
+        elif actual == id_fila:
+            del self._indice_nombres[clave]
+
+    def buscar(self, nombre: str) -> List[int]:
+        """Ids de las filas cuyo 'name' coincide (ignora mayúsculas), en orden de alta."""
+        ids = self._indice_nombres.get(self._clave_nombre(nombre))
+        if ids is None:
+            return []
+        return sorted(ids) if isinstance(ids, set) else [ids]
+
+    # ---------- CRUD ----------
+
+    def agregar(self, fila: dict) -> int:
+        """Agrega una fila y devuelve su id."""
+        if self._usadas == len(self._arreglos["id"]):
+            self._crecer()
+        id_fila = self._siguiente_id
+        self._siguiente_id += 1
+        posicion = self._usadas
+        self._usadas += 1
+        self._arreglos["id"][posicion] = id_fila
+        self._arreglos["vivo"][posicion] = True
+        self._escribir(posicion, fila)
+        if isinstance(fila.get("name"), str):
+            self._indexar(fila["name"], id_fila)
+        return id_fila
+
+    def fila(self, id_fila: int) -> dict:
+        """Devuelve los datos de una fila; KeyError si no existe o fue borrada."""
+        posicion = self._posicion_o_error(id_fila)
+        a = self._arreglos
+        datos = {
+            "name": self._nombres.texto(int(a["name"][posicion])),
+            "type_1": self._tipos.texto(int(a["type_1"][posicion])),
+        }
+        for col in COLUMNAS_ESTADISTICAS:
+            datos[col] = int(a[col][posicion])
+        return datos
+
+    def actualizar(self, id_fila: int, cambios: dict) -> None:
+        """Cambia algunas columnas de una fila."""
+        posicion = self._posicion_o_error(id_fila)
+        if "name" in cambios:
+            anterior = self._nombres.texto(int(self._arreglos["name"][posicion]))
+            if cambios["name"] != anterior:
+                self._desindexar(anterior, id_fila)
+                self._indexar(cambios["name"], id_fila)
+        self._escribir(posicion, cambios)
+
+    def eliminar(self, id_fila: int) -> None:
+        """Borra una fila; KeyError si no existe o ya fue borrada."""
+        posicion = self._posicion_o_error(id_fila)
+        self._desindexar(self._nombres.texto(int(self._arreglos["name"][posicion])), id_fila)
+        self._arreglos["vivo"][posicion] = False
+        self._borradas += 1
+        if self._borradas >= max(MINIMO_PENDIENTES, self._usadas // 2):
+            self._compactar()
+
+    # ---------- mantenimiento ----------
+
+    def _escribir(self, posicion: int, valores: dict) -> None:
+        """Guarda en los arreglos las columnas presentes en 'valores'."""
+        for col, valor in valores.items():
+            if col == "name":
+                valor = self._codigo_nombre(valor)
+            elif col == "type_1":
+                valor = self._tipos.codigo(valor)
+            elif col not in COLUMNAS_ESTADISTICAS:
+                continue
+            self._ampliar_tipo(col, valor)
+            self._arreglos[col][posicion] = valor
+
+    def _codigo_nombre(self, nombre) -> int:
+        """Código de 'nombre' en la tabla, reutilizando el de otra fila con el mismo nombre."""
+        if not isinstance(nombre, str):
+            return -1
+        if self._codigos_nombres is None:
+            self._codigos_nombres = {texto: codigo for codigo, texto in enumerate(self._nombres.textos())}
+        codigo = self._codigos_nombres.get(nombre)
+        if codigo is None:
+            codigo = self._nombres.agregar(nombre)
+            self._codigos_nombres[nombre] = codigo
+        return codigo
+
+    def _tipo_para(self, col: str, valores: np.ndarray):
+        """El tipo inicial de la columna si todos los valores caben; si no, int64."""
+        tipo = np.dtype(self.TIPOS[col])
+        if tipo.kind != "i" or len(valores) == 0:
+            return tipo
+        info = np.iinfo(tipo)
+        if valores.min() >= info.min and valores.max() <= info.max:
+            return tipo
+        return np.dtype(np.int64)
+
+    def _ampliar_tipo(self, col: str, valor: int) -> None:
+        """Pasa un arreglo entero a int64 si 'valor' no cabe en su tipo."""
+        arreglo = self._arreglos[col]
+        minimo, maximo = _rango_entero(arreglo.dtype)
+        if not minimo <= valor <= maximo:
+            self._arreglos[col] = arreglo.astype(np.int64)
+
+    def _crecer(self) -> None:
+        """Duplica la capacidad de todos los arreglos."""
+        capacidad = max(MINIMO_PENDIENTES, 2 * len(self._arreglos["id"]))
+        for col, arreglo in self._arreglos.items():
+            nuevo = np.empty(capacidad, dtype=arreglo.dtype)
+            nuevo[:self._usadas] = arreglo[:self._usadas]
+            self._arreglos[col] = nuevo
+
+    def _compactar(self) -> None:
+        """Quita las filas borradas y los nombres que ya nadie usa."""
+        vivas = self._arreglos["vivo"][:self._usadas]
+        for col, arreglo in self._arreglos.items():
+            self._arreglos[col] = arreglo[:self._usadas][vivas]
+        nombres = self._arreglos["name"]
+        if self._codigos_nombres is not None:
+            # reducir numera los textos conservados en orden de código viejo
+            conservados = np.unique(nombres[nombres >= 0]).tolist()
+            textos = list(self._codigos_nombres)
+            self._codigos_nombres = {textos[viejo]: nuevo for nuevo, viejo in enumerate(conservados)}
+        self._arreglos["name"] = self._nombres.reducir(nombres)
+        self._usadas = len(self._arreglos["id"])
+        self._borradas = 0
+
+
+# ===================== RESOLUCIÓN DE BATALLAS =====================
+
+def calcular_daño(atacante: Mapping, defensor: Mapping) -> int:
+    """Calcula el daño de un turno de ataque."""
+    base = int(atacante["attack"]) - int(defensor["defense"]) // 2
+    return max(1, base)
+
+
+class ResultadoBatalla:
+    """Resultado de resolver_batalla.
+
+    ganador es 1 o 2 (0 si empatan, lo que solo pasa si ambos empiezan sin HP),
+    rondas la cantidad de ataques y hp1/hp2 la vida que le queda a cada uno
+    (nunca negativa). registro() produce el relato ronda por ronda solo si se
+    pide, y con el mismo texto que imprimía la simulación.
+    """
+
+    __slots__ = ("p1", "p2", "ganador", "rondas", "hp1", "hp2", "_primero_p1")
+
+    def __init__(self, p1: Mapping, p2: Mapping, ganador: int, rondas: int,
+                 hp1: int, hp2: int, primero_p1: bool) -> None:
+        self.p1 = p1
+        self.p2 = p2
+        self.ganador = ganador
+        self.rondas = rondas
+        self.hp1 = hp1
+        self.hp2 = hp2
+        self._primero_p1 = primero_p1
+
+    def __repr__(self) -> str:
+        return (f"ResultadoBatalla(ganador={self.ganador}, rondas={self.rondas}, "
+                f"hp1={self.hp1}, hp2={self.hp2})")
+
+    def registro(self) -> Iterator[str]:
+        """Genera las líneas del relato de la batalla, una ronda a la vez."""
+        p1, p2 = self.p1, self.p2
+        hp1, hp2 = int(p1["hp"]), int(p2["hp"])
+        daño1, daño2 = calcular_daño(p1, p2), calcular_daño(p2, p1)
+        turno_p1 = self._primero_p1
+        for ronda in range(1, self.rondas + 1):
+            yield f"--- Ronda {ronda} ---"
+            if turno_p1:
+                hp2 -= daño1
+                yield (f"{p1['name']} ataca a {p2['name']} y causa {daño1} de daño. "
+                       f"HP restante de {p2['name']}: {max(hp2, 0)}")
+            else:
+                hp1 -= daño2
+                yield (f"{p2['name']} ataca a {p1['name']} y causa {daño2} de daño. "
+                       f"HP restante de {p1['name']}: {max(hp1, 0)}")
+            turno_p1 = not turno_p1
+
+
+def resolver_batalla(p1: Mapping, p2: Mapping) -> ResultadoBatalla:
+    """Resuelve una batalla 1 vs 1 en O(1), sin simular ronda por ronda.
+
+    El daño de cada lado es constante, así que cada uno necesita
+    ceil(hp_rival / daño) ataques para ganar. Comienza el más rápido (si
+    empatan en speed, p1) y los ataques se alternan: gana quien complete sus
+    ataques primero, y en empate de ataques gana el que comenzó.
+    """
+    hp1, hp2 = int(p1["hp"]), int(p2["hp"])
+    primero_p1 = int(p1["speed"]) >= int(p2["speed"])
+
+    if hp1 <= 0 or hp2 <= 0:
+        # La simulación no llegaba a ninguna ronda
+        ganador = 0 if hp1 <= 0 and hp2 <= 0 else (1 if hp1 > 0 else 2)
+        return ResultadoBatalla(p1, p2, ganador, 0, max(hp1, 0), max(hp2, 0), primero_p1)
+
+    daño1, daño2 = calcular_daño(p1, p2), calcular_daño(p2, p1)
+    # ceil(hp / daño) en enteros, exacto para cualquier tamaño
+    ataques1 = -(-hp2 // daño1)
+    ataques2 = -(-hp1 // daño2)
+
+    if primero_p1:
+        gana_p1 = ataques1 <= ataques2
+        rondas = 2 * ataques1 - 1 if gana_p1 else 2 * ataques2
+    else:
+        gana_p1 = ataques1 < ataques2
+        rondas = 2 * ataques1 if gana_p1 else 2 * ataques2 - 1
+
+    if gana_p1:
+        # El perdedor alcanzó a atacar una vez menos que el ganador si este
+        # comenzó, o las mismas veces si comenzó el perdedor
+        recibidos = ataques1 - 1 if primero_p1 else ataques1
+        return ResultadoBatalla(p1, p2, 1, rondas, hp1 - recibidos * daño2, 0, primero_p1)
+    recibidos = ataques2 if primero_p1 else ataques2 - 1
+    return ResultadoBatalla(p1, p2, 2, rondas, 0, hp2 - recibidos * daño1, primero_p1)
+
 
 class PokemonGame:
-    """Gestor de pokémons y batallas basado en un DataFrame de pandas."""
+    """Gestor de pokémons y batallas; los datos viven en un Plantel."""
 
     def __init__(self) -> None:
-        self.df = pd.DataFrame()
+        self.plantel = Plantel()
         # Ruta actual del CSV que se está usando
         self.csv_path = DEFAULT_CSV_PATH
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """Copia de las filas vivas del plantel como DataFrame (índice = id de fila).
+
+        Cada acceso arma una copia nueva: 'juego.df.at[i, "hp"] = 50' se
+        pierde. Los cambios se hacen con self.plantel.actualizar(i, {...}),
+        o asignando un DataFrame completo a 'df', que reemplaza el plantel.
+        """
+        return self.plantel.df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self.plantel = Plantel(df)
+
     # ===================== CARGA / GUARDADO =====================
 
     def load_from_csv(self, ruta: str) -> None:
         """Carga los pokémons desde un archivo CSV usando pandas.
 
-        Si 'ruta' es relativa, se interpreta respecto a BASE_DIR.
+        Si 'ruta' es relativa, se interpreta respecto a BASE_DIR. Solo se leen
+        las columnas del juego, y el resultado se guarda en un snapshot binario
+        junto al CSV para que la próxima carga no tenga que parsearlo.
         """
         # Si la ruta no es absoluta, la hacemos relativa al directorio del script
         if not os.path.isabs(ruta):
             ruta = os.path.join(BASE_DIR, ruta)
 
         try:
-            df_full = pd.read_csv(ruta)
+            df = leer_pokemon(ruta)
         except FileNotFoundError:
             print(f"[ERROR] No se encontró el archivo: {ruta}")
             return
+        except ColumnaFaltante as e:
+            print(f"[ERROR] La columna requerida '{e.args[0]}' no está en el CSV.")
+            return
 
-        columnas_necesarias = ["name", "type_1", "hp", "attack", "defense", "speed"]
-        for col in columnas_necesarias:
-            if col not in df_full.columns:
-                print(f"[ERROR] La columna requerida '{col}' no está en el CSV.")
-                return
-
-        df = df_full[columnas_necesarias].copy()
-
-        # Asegurar tipos numéricos
-        for col in ["hp", "attack", "defense", "speed"]:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-        # Eliminar filas con datos numéricos inválidos
-        df = df.dropna(subset=["hp", "attack", "defense", "speed"])
-        df[["hp", "attack", "defense", "speed"]] = df[
-            ["hp", "attack", "defense", "speed"]
-        ].astype(int)
-
-        self.df = df.reset_index(drop=True)
+        self.df = df
         self.csv_path = ruta
 
-        print(f"[OK] Pokémons cargados desde '{ruta}': {len(self.df)} filas válidas.")
+        print(f"[OK] Pokémons cargados desde '{ruta}': {len(self.plantel)} filas válidas.")
 
     def save_to_csv(self, ruta: str) -> None:
         """Guarda el DataFrame actual a un archivo CSV.
 
         Si 'ruta' es relativa, se interpreta respecto a BASE_DIR.
         """
-        if self.df.empty:
+        if len(self.plantel) == 0:
             print("[ADVERTENCIA] No hay pokémons para guardar.")
             return
 
@@ -101,25 +746,22 @@ class PokemonGame:
                 print("Entrada no válida. Intente de nuevo.")
 
     def _buscar_indice_por_nombre(self, nombre: str):
-        """Devuelve el índice de la primera fila cuyo 'name' coincide (ignora mayúsculas)."""
-        if self.df.empty:
+        """Devuelve el id de la primera fila cuyo 'name' coincide (ignora mayúsculas)."""
+        ids = self.plantel.buscar(nombre)
+        if not ids:
             return None
-        mask = self.df["name"].str.lower() == nombre.lower()
-        indices = self.df[mask].index
-        if len(indices) == 0:
-            return None
-        return indices[0]
+        return ids[0]
 
     # ===================== CRUD =====================
 
     def listar_pokemons(self) -> None:
         """Muestra una lista de pokémons con sus estadísticas básicas."""
-        if self.df.empty:
+        if len(self.plantel) == 0:
             print("[INFO] No hay pokémons cargados.")
             return
 
         print("\n=== Lista de Pokémons (primeras 20 filas) ===")
-        print(self.df.head(20).to_string(index=False))
+        print(self.plantel.primeras(20).to_string(index=False))
 
     def agregar_pokemon(self) -> None:
         """Agrega un nuevo pokémon al DataFrame."""
@@ -144,10 +786,7 @@ class PokemonGame:
             "speed": speed,
         }
 
-        self.df = pd.concat(
-            [self.df, pd.DataFrame([nueva_fila])],
-            ignore_index=True
-        )
+        self.plantel.agregar(nueva_fila)
         print(f"[OK] Pokémon '{name}' agregado.")
 
     def modificar_pokemon(self) -> None:
@@ -159,8 +798,8 @@ class PokemonGame:
             print("[ERROR] No se encontró ese Pokémon.")
             return
 
-        fila = self.df.loc[idx]
-        print(f"Pokémon actual: {fila.to_dict()}")
+        fila = self.plantel.fila(idx)
+        print(f"Pokémon actual: {fila}")
         print("Deje el campo vacío para mantener el valor actual.")
 
         nuevo_nombre = input(f"Nuevo name [{fila['name']}]: ").strip()
@@ -187,45 +826,48 @@ class PokemonGame:
             f"Nuevo speed [{fila['speed']}]: ", int(fila["speed"])
         )
 
+        cambios = {
+            "hp": nuevo_hp,
+            "attack": nuevo_atk,
+            "defense": nuevo_def,
+            "speed": nuevo_spd,
+        }
         if nuevo_nombre:
-            self.df.at[idx, "name"] = nuevo_nombre
+            cambios["name"] = nuevo_nombre
         if nuevo_tipo:
-            self.df.at[idx, "type_1"] = nuevo_tipo
-        self.df.at[idx, "hp"] = nuevo_hp
-        self.df.at[idx, "attack"] = nuevo_atk
-        self.df.at[idx, "defense"] = nuevo_def
-        self.df.at[idx, "speed"] = nuevo_spd
+            cambios["type_1"] = nuevo_tipo
+        self.plantel.actualizar(idx, cambios)
 
         print("[OK] Pokémon actualizado.")
-        print(self.df.loc[idx].to_dict())
+        print(self.plantel.fila(idx))
 
     def eliminar_pokemon(self) -> None:
         """Elimina un pokémon por nombre."""
         print("\n=== Eliminar Pokémon ===")
         nombre = input("Nombre del Pokémon a eliminar: ").strip()
-        if self.df.empty:
+        if len(self.plantel) == 0:
             print("[ERROR] No hay pokémons cargados.")
             return
 
-        mask = self.df["name"].str.lower() == nombre.lower()
-        count = mask.sum()
-        if count == 0:
+        ids = self.plantel.buscar(nombre)
+        if not ids:
             print("[ERROR] No se encontró ese Pokémon.")
             return
 
-        self.df = self.df[~mask].reset_index(drop=True)
+        count = len(ids)
+        for id_fila in ids:
+            self.plantel.eliminar(id_fila)
         print(f"[OK] Se eliminaron {count} fila(s) con nombre '{nombre}'.")
 
     # ===================== BATALLA =====================
 
-    @staticmethod
-    def _calcular_daño(row_atacante, row_defensor) -> int:
-        """Calcula el daño de un turno de ataque."""
-        base = int(row_atacante["attack"]) - int(row_defensor["defense"]) // 2
-        return max(1, base)
+    _calcular_daño = staticmethod(calcular_daño)
 
-    def batalla(self) -> None:
-        """Simula una batalla 1 vs 1 entre dos pokémons."""
+    def batalla(self, mostrar_rondas: bool = True) -> None:
+        """Resuelve una batalla 1 vs 1 entre dos pokémons (ver resolver_batalla).
+
+        Con mostrar_rondas=False solo se informa la cantidad de rondas y el ganador.
+        """
         print("\n=== Batalla Pokémon ===")
         nombre1 = input("Nombre del primer Pokémon: ").strip()
         nombre2 = input("Nombre del segundo Pokémon: ").strip()
@@ -237,38 +879,22 @@ class PokemonGame:
             print("[ERROR] Uno o ambos pokémons no existen.")
             return
 
-        p1 = self.df.loc[idx1]
-        p2 = self.df.loc[idx2]
-
-        hp1 = int(p1["hp"])
-        hp2 = int(p2["hp"])
+        p1 = self.plantel.fila(idx1)
+        p2 = self.plantel.fila(idx2)
 
         print(f"\nBatalla entre {p1['name']} ({p1['type_1']}) "
               f"y {p2['name']} ({p2['type_1']})!\n")
 
-        # Comienza el más rápido; si empatan, empieza el primero
-        turno_p1 = int(p1["speed"]) >= int(p2["speed"])
-        ronda = 1
-
-        while hp1 > 0 and hp2 > 0:
-            print(f"--- Ronda {ronda} ---")
-            if turno_p1:
-                daño = self._calcular_daño(p1, p2)
-                hp2 -= daño
-                print(f"{p1['name']} ataca a {p2['name']} y causa {daño} de daño. "
-                      f"HP restante de {p2['name']}: {max(hp2, 0)}")
-            else:
-                daño = self._calcular_daño(p2, p1)
-                hp1 -= daño
-                print(f"{p2['name']} ataca a {p1['name']} y causa {daño} de daño. "
-                      f"HP restante de {p1['name']}: {max(hp1, 0)}")
-
-            turno_p1 = not turno_p1
-            ronda += 1
+        resultado = resolver_batalla(p1, p2)
+        if mostrar_rondas:
+            for linea in resultado.registro():
+                print(linea)
+        else:
+            print(f"La batalla duró {resultado.rondas} ronda(s).")
 
-        if hp1 <= 0 and hp2 <= 0:
+        if resultado.ganador == 0:
             print("\n¡Empate! Ambos pokémons han sido derrotados.")
-        elif hp1 > 0:
+        elif resultado.ganador == 1:
             print(f"\n¡{p1['name']} gana la batalla!")
         else:
             print(f"\n¡{p2['name']} gana la batalla!")
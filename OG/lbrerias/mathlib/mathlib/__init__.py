@@ -1 +1,25 @@
+from importlib import import_module
+
 from .operations import add, subtract, multiply, divide
+
+# The batch, expression and streaming helpers need NumPy; they are imported
+# on first use so the scalar operations above work without it installed.
+_LAZY = {
+    **dict.fromkeys(['add_batch', 'subtract_batch', 'multiply_batch', 'divide_batch'], '.batch'),
+    **dict.fromkeys(['Expression', 'compile_expression'], '.expressions'),
+    **dict.fromkeys(['RunningStats', 'stream_sum', 'stream_mean', 'stream_variance',
+                     'stream_min', 'stream_max', 'stream_product'], '.reductions'),
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,45 @@
+# mathlib/mathlib/batch.py
+# Batch versions of the operations in operations.py. They take NumPy arrays,
+# lists or any iterable of numbers and broadcast like NumPy ufuncs, so a whole
+# column can be processed in one call.
+import numpy as np
+
+
+def _as_array(values):
+    """Convert any iterable of numbers to a float array (arrays pass through)."""
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    if np.isscalar(values):
+        return np.float64(values)
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except TypeError:
+        # Generators and other one-shot iterables
+        return np.fromiter(values, dtype=np.float64)
+
+
+def add_batch(a, b):
+    """Return the element-wise sum of two arrays or iterables."""
+    return np.add(_as_array(a), _as_array(b))
+
+def subtract_batch(a, b):
+    """Return the element-wise difference of two arrays or iterables."""
+    return np.subtract(_as_array(a), _as_array(b))
+
+def multiply_batch(a, b):
+    """Return the element-wise product of two arrays or iterables."""
+    return np.multiply(_as_array(a), _as_array(b))
+
+def divide_batch(a, b):
+    """Return (quotients, zero_mask) for the element-wise division a / b.
+
+    Instead of raising on the first zero divisor, positions where b is zero
+    are marked True in zero_mask and their quotient is NaN.
+    """
+    a = _as_array(a)
+    b = _as_array(b)
+    zero_mask = np.broadcast_to(b == 0, np.broadcast_shapes(np.shape(a), np.shape(b)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.divide(a, b)
+    result = np.where(zero_mask, np.nan, result)
+    return result, zero_mask.copy()
@@ -0,0 +1,130 @@
+# mathlib/mathlib/expressions.py
+# Arithmetic expressions over named variables, e.g. "a * b + c / 2".
+# An expression is parsed and checked once, then compiled into a code object
+# in which every operator is a call to a mathlib function. The same code runs
+# on single values (operations.py) or on whole columns (batch.py).
+import ast
+import operator
+from functools import lru_cache
+
+import numpy as np
+
+from .batch import _as_array, add_batch, subtract_batch, multiply_batch, divide_batch
+from .operations import add, subtract, multiply, divide
+
+# Operator node -> name of the function it is compiled into
+_BINARY_OPERATORS = {
+    ast.Add: '_add',
+    ast.Sub: '_subtract',
+    ast.Mult: '_multiply',
+    ast.Div: '_divide',
+    ast.Pow: '_power',
+}
+
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+_SCALAR_FUNCTIONS = {
+    '_add': add,
+    '_subtract': subtract,
+    '_multiply': multiply,
+    '_divide': divide,
+    '_power': operator.pow,
+}
+
+_BATCH_FUNCTIONS = {
+    '_add': add_batch,
+    '_subtract': subtract_batch,
+    '_multiply': multiply_batch,
+    '_divide': lambda a, b: divide_batch(a, b)[0],
+    '_power': lambda a, b: np.power(_as_array(a), _as_array(b)),
+}
+
+
+class _Compiler(ast.NodeTransformer):
+    """Reject anything that is not arithmetic and turn operators into calls."""
+
+    def __init__(self):
+        self.variables = []
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        name = _BINARY_OPERATORS.get(type(node.op))
+        if name is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        call = ast.Call(func=ast.Name(id=name, ctx=ast.Load()),
+                        args=[self.visit(node.left), self.visit(node.right)],
+                        keywords=[])
+        return ast.copy_location(call, node)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith('_'):
+            raise ValueError(f"Invalid variable name: {node.id}")
+        if node.id not in self.variables:
+            self.variables.append(node.id)
+        return node
+
+
+class Expression:
+    """A compiled expression; use compile_expression to build one."""
+
+    def __init__(self, text):
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression {text!r}: {e.msg}") from None
+        compiler = _Compiler()
+        tree = ast.fix_missing_locations(compiler.visit(tree))
+        self.text = text
+        self.variables = tuple(compiler.variables)
+        self._code = compile(tree, f'<expression {text!r}>', 'eval')
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    def _bind(self, values, functions):
+        namespace = {'__builtins__': {}, **functions}
+        for name in self.variables:
+            if name not in values:
+                raise ValueError(f"Missing value for variable '{name}'")
+            namespace[name] = values[name]
+        return namespace
+
+    def __call__(self, **values):
+        """Evaluate for single values; dividing by zero raises ValueError."""
+        return eval(self._code, self._bind(values, _SCALAR_FUNCTIONS))
+
+    def evaluate(self, columns=None, **arrays):
+        """Evaluate over whole columns in one vectorized pass.
+
+        columns is a mapping of variable name to array or iterable (keyword
+        arguments work too); the columns broadcast against each other. Rows
+        that divide by zero are NaN, as in divide_batch.
+        """
+        values = dict(columns or {}, **arrays)
+        values = {name: _as_array(values[name]) for name in self.variables if name in values}
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.asarray(eval(self._code, self._bind(values, _BATCH_FUNCTIONS)),
+                              dtype=np.float64)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """Return the compiled Expression for text, cached by the expression text."""
+    return Expression(text)
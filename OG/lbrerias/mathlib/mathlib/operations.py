@@ -5,7 +5,10 @@
 # mathlib/
 # ├── mathlib/
 # │   ├── __init__.py
-# │   └── operations.py
+# │   ├── operations.py
+# │   ├── batch.py
+# │   ├── expressions.py
+# │   └── reductions.py
 # └── setup.py
 
 # mathlib/mathlib/operations.py
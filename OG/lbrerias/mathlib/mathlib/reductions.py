@@ -0,0 +1,217 @@
+# mathlib/mathlib/reductions.py
+# Streaming reductions: sum, mean, variance, min/max and product over
+# iterables of any length in constant memory. Input may be single numbers or
+# chunks (arrays, lists); single numbers are buffered into chunks, and every
+# chunk is reduced with NumPy and folded into the running totals.
+import math
+from collections.abc import Iterable
+
+import numpy as np
+
+from .batch import _as_array
+
+# Single values buffered before they are reduced as one NumPy chunk
+CHUNK_SIZE = 65_536
+
+
+def _nan_aware(function, a, b):
+    """min/max of two floats that returns NaN if either is NaN, like np.minimum."""
+    if math.isnan(a) or math.isnan(b):
+        return math.nan
+    return function(a, b)
+
+
+def _compensated_sum(chunk):
+    """Pairwise sum of a finite chunk that also adds up every rounding error.
+
+    Each pass adds neighbouring pairs and recovers the error of every addition
+    with Knuth's TwoSum, so cancellations such as 1e16 + 1.0 - 1e16 keep the 1.0.
+    """
+    errors = 0.0
+    while chunk.size > 1:
+        if chunk.size % 2:
+            chunk = np.append(chunk, 0.0)
+        a, b = chunk[0::2], chunk[1::2]
+        chunk = a + b
+        b_virtual = chunk - a
+        errors += float(np.sum((a - (chunk - b_virtual)) + (b - b_virtual)))
+    total = float(chunk[0])
+    # An overflowed pair leaves NaN errors; keep the inf like np.sum does
+    return total + errors if math.isfinite(total) else total
+
+
+class RunningStats:
+    """Accumulates count, sum, mean, variance, min, max and product.
+
+    The running sum uses Neumaier (improved Kahan) compensation across chunks,
+    and each chunk is summed pairwise with the rounding error of every addition
+    carried along, or exactly with math.fsum when exact=True. Mean and variance are merged chunk by chunk with Chan's
+    parallel form of Welford's algorithm, so they do not drift over billions
+    of values. A NaN value (e.g. a failed result) makes every reduction NaN,
+    as with np.sum and np.min; with ignore_nan=True NaN values are skipped
+    instead, as with np.nansum and np.nanmin.
+    """
+
+    def __init__(self, exact=False, ignore_nan=False, chunk_size=CHUNK_SIZE):
+        self.exact = exact
+        self.ignore_nan = ignore_nan
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._sum = 0.0
+        self._compensation = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._product = 1.0
+        self._pending = []
+
+    def update(self, value):
+        """Add one number."""
+        self._pending.append(value)
+        if len(self._pending) >= self.chunk_size:
+            self._flush()
+
+    def update_batch(self, values):
+        """Add a chunk of numbers (array, list or any iterable)."""
+        self._flush()
+        values = np.ravel(_as_array(values))
+        # Large arrays are reduced in slices to keep temporaries small
+        for start in range(0, values.size, self.chunk_size):
+            self._reduce(values[start:start + self.chunk_size])
+
+    def consume(self, iterable):
+        """Add every item of iterable; items may be numbers or chunks."""
+        for item in iterable:
+            if isinstance(item, (np.ndarray, list, tuple)):
+                self.update_batch(item)
+            else:
+                self.update(item)
+        return self
+
+    def merge(self, other):
+        """Fold another RunningStats (e.g. from another shard) into this one."""
+        self._flush()
+        other._flush()
+        self._combine(other.count, other._sum + other._compensation, other._mean,
+                      other._m2, other._min, other._max, other._product)
+        return self
+
+    def _flush(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._reduce(np.asarray(pending, dtype=np.float64))
+
+    def _reduce(self, chunk):
+        if self.ignore_nan:
+            chunk = chunk[~np.isnan(chunk)]
+        n = chunk.size
+        if n == 0:
+            return
+        with np.errstate(over='ignore', invalid='ignore'):
+            # fsum rejects inf - inf and TwoSum turns inf into NaN; chunks
+            # with inf or NaN have no rounding error worth keeping anyway
+            if not np.isfinite(chunk).all():
+                total = float(np.sum(chunk))
+            elif self.exact:
+                total = math.fsum(chunk.tolist())
+            else:
+                total = _compensated_sum(chunk)
+            mean = total / n
+            m2 = float(np.sum(np.square(chunk - mean)))
+            product = float(np.prod(chunk))
+        self._combine(n, total, mean, m2, float(chunk.min()), float(chunk.max()), product)
+
+    def _combine(self, n, total, mean, m2, minimum, maximum, product):
+        if n == 0:
+            return
+        # Neumaier compensated addition of the chunk total; once the sum is
+        # inf or NaN the correction term would only turn it into NaN
+        t = self._sum + total
+        if math.isfinite(t):
+            if abs(self._sum) >= abs(total):
+                self._compensation += (self._sum - t) + total
+            else:
+                self._compensation += (total - t) + self._sum
+        self._sum = t
+        # Chan et al. merge of (count, mean, M2)
+        count = self.count + n
+        delta = mean - self._mean
+        self._mean += delta * n / count
+        self._m2 += m2 + delta * delta * self.count * n / count
+        self.count = count
+        self._min = _nan_aware(min, self._min, minimum)
+        self._max = _nan_aware(max, self._max, maximum)
+        self._product *= product
+
+    def _require_data(self):
+        self._flush()
+        if self.count == 0:
+            raise ValueError("No data to reduce.")
+
+    @property
+    def sum(self):
+        self._flush()
+        return self._sum + self._compensation
+
+    @property
+    def mean(self):
+        self._require_data()
+        return self._mean
+
+    def variance(self, ddof=0):
+        """Population variance by default; ddof=1 for the sample variance."""
+        self._require_data()
+        if self.count <= ddof:
+            raise ValueError("Not enough data for the requested degrees of freedom.")
+        return self._m2 / (self.count - ddof)
+
+    @property
+    def min(self):
+        self._require_data()
+        return self._min
+
+    @property
+    def max(self):
+        self._require_data()
+        return self._max
+
+    @property
+    def product(self):
+        self._flush()
+        return self._product
+
+
+def _stats(values, **options):
+    if not isinstance(values, Iterable):
+        raise TypeError("Expected an iterable of numbers or chunks.")
+    if isinstance(values, np.ndarray):
+        stats = RunningStats(**options)
+        stats.update_batch(values)
+        return stats
+    return RunningStats(**options).consume(values)
+
+
+def stream_sum(values, **options):
+    """Return the compensated sum of an iterable of numbers or chunks."""
+    return _stats(values, **options).sum
+
+def stream_mean(values, **options):
+    """Return the mean of an iterable of numbers or chunks."""
+    return _stats(values, **options).mean
+
+def stream_variance(values, ddof=0, **options):
+    """Return the variance (Welford/Chan) of an iterable of numbers or chunks."""
+    return _stats(values, **options).variance(ddof)
+
+def stream_min(values, **options):
+    """Return the smallest value of an iterable of numbers or chunks."""
+    return _stats(values, **options).min
+
+def stream_max(values, **options):
+    """Return the largest value of an iterable of numbers or chunks."""
+    return _stats(values, **options).max
+
+def stream_product(values, **options):
+    """Return the product of an iterable of numbers or chunks."""
+    return _stats(values, **options).product
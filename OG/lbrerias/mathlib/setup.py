@@ -7,6 +7,8 @@ setup(
     name="mathlib",
     version="0.1",
     packages=find_packages(),
+    # Only the batch, expression and streaming helpers need NumPy
+    extras_require={'numpy': ['numpy']},
     description="A simple math library for basic operations.",
     author="Your Name",
     author_email="your.email@example.com",
@@ -24,9 +26,25 @@ setup(
 # 1. Navigate to the directory containing the setup.py file.
 # 2. Run the following command to install the library:
 #    pip install .
+#    (or pip install ".[numpy]" for the batch, expression and streaming helpers)
 
 # 3. You can now use the library in your Python scripts as follows:
 #    from mathlib import add, subtract, multiply, divide
+#    from mathlib import add_batch, subtract_batch, multiply_batch, divide_batch
 
 #    result = add(10, 5)
 #    print(result)  # Output: 15
+
+#    quotients, zero_mask = divide_batch([10, 4, 1], [2, 0, 4])
+#    print(quotients)   # Output: [5.   nan 0.25]
+#    print(zero_mask)   # Output: [False  True False]
+
+#    from mathlib import compile_expression
+#    formula = compile_expression('a * b + c / 2')
+#    print(formula(a=2, b=3, c=5))                          # Output: 8.5
+#    print(formula.evaluate({'a': [1, 2], 'b': [3, 4], 'c': [0, 1]}))  # Output: [3.  8.5]
+
+#    from mathlib import RunningStats, stream_sum
+#    print(stream_sum([0.1] * 10))                       # Output: 1.0
+#    stats = RunningStats(ignore_nan=True).consume(chunks)  # numbers or arrays
+#    print(stats.mean, stats.variance(), stats.min, stats.max)
@@ -1,27 +1,183 @@
-import pandas as pd
-import random
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-# Define operations and their corresponding lambda functions
+import numpy as np
+
+# Define operations and their corresponding vectorized functions
 operations = {
-    'SUM': None,
-    'SUB': None,
-    'MUL': None,
-    'DIV': None,
-    'POW': None  # limit exponent to avoid very large numbers
+    'SUM': np.add,
+    'SUB': np.subtract,
+    'MUL': np.multiply,
+    'DIV': np.divide,
+    'POW': np.power
 }
 
-# Generate data
-data = []
-for _ in range(1000):
-    operation = random.choice(list(operations.keys()))
-    operand_1 = random.randint(1, 1000)
-    operand_2 = random.randint(1, 1000)
-    if operation == 'POW' and operand_2 < 10: operand_2 = random.randint(1, 15)
-    data.append([operation, operand_1, operand_2])
-
-# Create DataFrame
-df = pd.DataFrame(data, columns=['operation', 'operand_1', 'operand_2'])
-
-# Save to CSV
-csv_path = './data/math_operations.csv'
-df.to_csv(csv_path, index=False)
\ No newline at end of file
+COLUMNS = ['operation', 'operand_1', 'operand_2', 'correct_result']
+
+# Rows generated and written at a time; bounds memory for any file size
+CHUNK_SIZE = 250_000
+
+
+def correct_results(codes, operand_1, operand_2):
+    """Compute correct_result for a chunk; NaN where it is not a finite number."""
+    a = operand_1.astype(np.float64)
+    b = operand_2.astype(np.float64)
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        results = np.choose(codes, [function(a, b) for function in operations.values()])
+    results[~np.isfinite(results)] = np.nan
+    return results
+
+
+def generate_chunks(n_rows=1000, seed=None, chunk_size=CHUNK_SIZE):
+    """Yield (operation, operand_1, operand_2, correct_result) arrays of up to chunk_size rows.
+
+    Each column is drawn from its own generator spawned from the seed, so the
+    same seed produces the same rows whatever the chunk size.
+    """
+    names = np.array(list(operations))
+    pow_code = list(operations).index('POW')
+    ops_rng, op1_rng, op2_rng, pow_rng = [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+    for start in range(0, n_rows, chunk_size):
+        n = min(chunk_size, n_rows - start)
+        codes = ops_rng.integers(len(names), size=n)
+        operand_1 = op1_rng.integers(1, 1001, size=n)
+        operand_2 = op2_rng.integers(1, 1001, size=n)
+        # POW exponents below 10 are redrawn from 1..15
+        small_pow = (codes == pow_code) & (operand_2 < 10)
+        operand_2[small_pow] = pow_rng.integers(1, 16, size=int(small_pow.sum()))
+        yield names[codes], operand_1, operand_2, correct_results(codes, operand_1, operand_2)
+
+
+def format_chunk(operation, operand_1, operand_2, correct_result):
+    """Render a chunk as CSV lines; correct_result is left empty where it is NaN."""
+    results = ['' if r != r else repr(r) for r in correct_result.tolist()]
+    return ''.join(map('{},{},{},{}\n'.format,
+                       operation.tolist(), operand_1.tolist(), operand_2.tolist(), results))
+
+
+def generate_rows(n_rows=1000, seed=None):
+    """Yield [operation, operand_1, operand_2, correct_result] rows.
+
+    With the same seed the same rows are produced, so benchmarks can
+    regenerate identical files.
+    """
+    for chunk in generate_chunks(n_rows, seed):
+        for operation, operand_1, operand_2, result in zip(*(column.tolist() for column in chunk)):
+            yield [operation, operand_1, operand_2, '' if result != result else result]
+
+
+def generate_operations(n_rows=1000, seed=None):
+    """Return the generated rows as a DataFrame."""
+    import pandas as pd
+
+    return pd.DataFrame(list(generate_rows(n_rows, seed)), columns=COLUMNS)
+
+
+def write_operations_csv(csv_path, n_rows=1000, seed=None, chunk_size=CHUNK_SIZE):
+    """Stream the generated rows to a CSV file one chunk at a time.
+
+    Returns the SHA-256 hex digest of the written file.
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, 'wb') as f:
+        header = (','.join(COLUMNS) + '\n').encode('utf-8')
+        digest.update(header)
+        f.write(header)
+        for chunk in generate_chunks(n_rows, seed, chunk_size):
+            data = format_chunk(*chunk).encode('utf-8')
+            digest.update(data)
+            f.write(data)
+    return digest.hexdigest()
+
+
+def shard_paths(csv_path, n_shards):
+    """Shard files for csv_path: data.csv -> data_0000.csv, data_0001.csv, ..."""
+    stem, ext = os.path.splitext(csv_path)
+    return [f'{stem}_{i:04d}{ext or ".csv"}' for i in range(n_shards)]
+
+
+def manifest_path(csv_path):
+    """Manifest file for csv_path: data.csv -> data.manifest.json"""
+    return os.path.splitext(csv_path)[0] + '.manifest.json'
+
+
+def _write_shard(path, n_rows, seed, chunk_size):
+    checksum = write_operations_csv(path, n_rows, seed, chunk_size)
+    return {'file': os.path.basename(path), 'rows': n_rows, 'seed': seed, 'sha256': checksum}
+
+
+def write_sharded_csv(csv_path, n_rows, n_shards, seed=None, workers=None,
+                      manifest=False, chunk_size=CHUNK_SIZE):
+    """Write n_rows split across n_shards files, generated in parallel processes.
+
+    Each shard's seed is spawned from the master seed, so the same master seed
+    always gives the same shards, and any single shard can be regenerated on
+    its own with write_operations_csv(path, rows, seed). With manifest=True a
+    JSON file listing every shard's rows, seed and SHA-256 is written next to
+    the shards. Returns the list of shard entries.
+    """
+    if n_shards < 1:
+        raise ValueError('n_shards must be at least 1')
+    master = np.random.SeedSequence(seed)
+    # 128-bit integer seeds: plain ints are easy to store in the manifest
+    seeds = [int.from_bytes(child.generate_state(4).tobytes(), 'little')
+             for child in master.spawn(n_shards)]
+    base, extra = divmod(n_rows, n_shards)
+    rows = [base + (i < extra) for i in range(n_shards)]
+    paths = shard_paths(csv_path, n_shards)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = list(executor.map(_write_shard, paths, rows, seeds,
+                                   [chunk_size] * n_shards))
+
+    if manifest:
+        with open(manifest_path(csv_path), 'w', encoding='utf-8') as f:
+            json.dump({'seed': master.entropy, 'rows': n_rows, 'columns': COLUMNS,
+                       'shards': shards}, f, indent=2)
+    return shards
+
+
+def verify_shards(manifest_file):
+    """Return the shard files whose SHA-256 no longer matches the manifest."""
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    folder = os.path.dirname(manifest_file)
+    mismatched = []
+    for shard in manifest['shards']:
+        path = os.path.join(folder, shard['file'])
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except FileNotFoundError:
+            mismatched.append(shard['file'])
+            continue
+        if digest.hexdigest() != shard['sha256']:
+            mismatched.append(shard['file'])
+    return mismatched
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a math operations CSV.')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default='./data/math_operations.csv')
+    parser.add_argument('--shards', type=int, default=None,
+                        help='split the rows across this many files written in parallel')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processes used with --shards (default: CPU count)')
+    parser.add_argument('--manifest', action='store_true',
+                        help='with --shards, also write a manifest with row counts and checksums')
+    args = parser.parse_args()
+
+    if args.shards:
+        write_sharded_csv(args.output, args.rows, args.shards, args.seed,
+                          args.workers, args.manifest)
+    else:
+        write_operations_csv(args.output, args.rows, args.seed)
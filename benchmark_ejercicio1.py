@@ -0,0 +1,181 @@
+"""
+Benchmark de escalamiento para Ejercicio1.
+
+Genera archivos de operaciones sintéticos y reproducibles con el generador de
+OG/mini_proyecto_1.py (con semilla), mide procesar_archivo_csv de punta a
+punta en cada modo y cada función auxiliar por separado, y guarda
+rendimiento, memoria máxima y tiempo en un archivo JSON.
+
+Uso:
+    python benchmark_ejercicio1.py --tamanos 1000 100000 --salida resultados.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import Ejercicio1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "OG"))
+
+import mini_proyecto_1  # noqa: E402  (vive en OG/, no es un paquete)
+
+TAMANOS_POR_DEFECTO = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Opciones de procesar_archivo_csv para cada modo medido
+MODOS: Dict[str, dict] = {
+    "fila": {},
+    "streaming": {"streaming": True},
+    "vectorizado": {"vectorizado": True, "streaming": True},
+    "mapeado": {"mapeado": True},
+    "exacto": {"exacto": True, "streaming": True},
+    "paralelo": {"trabajadores": os.cpu_count() or 1, "streaming": True},
+    "asincrono": {"asincrono": True},
+}
+
+# Filas usadas para medir las funciones auxiliares por separado
+FILAS_FUNCIONES = 100_000
+
+
+def _rss_maximo_mb() -> float:
+    """Memoria residente máxima de este proceso (y sus hijos), en MB."""
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor
+    try:
+        # En Linux ru_maxrss se hereda a través de exec, así que un proceso
+        # recién lanzado arrastraría el máximo del padre; VmHWM no.
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return max(int(linea.split()[1]) / 1024, hijos)
+    except OSError:
+        pass
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, hijos)
+
+
+def _medir_corrida(ruta_csv: str, opciones: dict) -> dict:
+    """Se ejecuta en un proceso nuevo para que la memoria máxima sea solo suya."""
+    inicio = time.perf_counter()
+    Ejercicio1.procesar_archivo_csv(ruta_csv, mostrar=False, **opciones)
+    segundos = time.perf_counter() - inicio
+    return {"segundos": segundos, "rss_max_mb": _rss_maximo_mb()}
+
+
+def medir_modo(ruta_original: str, tamano: int, modo: str, carpeta: str) -> dict:
+    """Procesa una copia del archivo generado en un proceso aparte."""
+    copia = os.path.join(carpeta, f"corrida_{modo}.csv")
+    shutil.copyfile(ruta_original, copia)
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as ejecutor:
+        medicion = ejecutor.submit(_medir_corrida, copia, MODOS[modo]).result()
+    os.remove(copia)
+
+    return {
+        "tamano": tamano,
+        "modo": modo,
+        "segundos": medicion["segundos"],
+        "filas_por_segundo": tamano / medicion["segundos"] if medicion["segundos"] else 0.0,
+        "rss_max_mb": medicion["rss_max_mb"],
+    }
+
+
+def medir_funciones(semilla: int, filas: int = FILAS_FUNCIONES) -> List[dict]:
+    """Mide cada función auxiliar de Ejercicio1 sobre las mismas filas."""
+    datos = list(mini_proyecto_1.generate_rows(filas, semilla))
+    operaciones = [fila[0] for fila in datos]
+    textos1 = [str(fila[1]) for fila in datos]
+    textos2 = [str(fila[2]) for fila in datos]
+    op1 = [float(t) for t in textos1]
+    op2 = [float(t) for t in textos2]
+    resultados = [Ejercicio1.calcular_operacion(o, a, b)[0] for o, a, b in zip(operaciones, op1, op2)]
+    esperados = [str(r) if r is not None else "" for r in resultados]
+
+    casos = {
+        "convertir_numero": lambda: [Ejercicio1.convertir_numero(t) for t in textos1],
+        "calcular_operacion": lambda: [
+            Ejercicio1.calcular_operacion(o, a, b) for o, a, b in zip(operaciones, op1, op2)
+        ],
+        "calcular_operacion_exacta": lambda: [
+            Ejercicio1.calcular_operacion_exacta(o, int(a), int(b))
+            for o, a, b in zip(operaciones, op1, op2)
+        ],
+        "comparar_resultados": lambda: [
+            Ejercicio1.comparar_resultados(r, e)
+            for r, e in zip(resultados, esperados) if r is not None
+        ],
+    }
+    if Ejercicio1.np is not None:
+        arreglo1 = Ejercicio1.np.array(op1)
+        arreglo2 = Ejercicio1.np.array(op2)
+        casos["calcular_operaciones_lote"] = lambda: Ejercicio1.calcular_operaciones_lote(
+            operaciones, arreglo1, arreglo2
+        )
+
+    mediciones = []
+    for nombre, caso in casos.items():
+        # El mejor de 3 intentos reduce el ruido de otros procesos
+        segundos = min(timeit.repeat(caso, number=1, repeat=3))
+        mediciones.append({
+            "funcion": nombre,
+            "filas": filas,
+            "segundos": segundos,
+            "filas_por_segundo": filas / segundos if segundos else 0.0,
+        })
+    return mediciones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=float, nargs="+", default=TAMANOS_POR_DEFECTO,
+                        help="cantidades de filas a generar (acepta 1e6)")
+    parser.add_argument("--modos", nargs="+", choices=list(MODOS), default=list(MODOS),
+                        help="modos de procesar_archivo_csv a medir")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_ejercicio1.json",
+                        help="archivo JSON de resultados")
+    args = parser.parse_args()
+
+    if Ejercicio1.np is None and "vectorizado" in args.modos:
+        print("[ADVERTENCIA] NumPy no está instalado; se omite el modo vectorizado.")
+        args.modos.remove("vectorizado")
+
+    resultados = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "semilla": args.semilla,
+        "corridas": [],
+        "funciones": medir_funciones(args.semilla),
+    }
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for tamano in (int(t) for t in args.tamanos):
+            ruta = os.path.join(carpeta, f"operaciones_{tamano}.csv")
+            mini_proyecto_1.write_operations_csv(ruta, tamano, args.semilla)
+            for modo in args.modos:
+                medicion = medir_modo(ruta, tamano, modo, carpeta)
+                resultados["corridas"].append(medicion)
+                print(f"{tamano:>12,} filas  {modo:<12} {medicion['segundos']:9.3f} s  "
+                      f"{medicion['filas_por_segundo']:>14,.0f} filas/s  "
+                      f"{medicion['rss_max_mb']:8.1f} MB")
+            os.remove(ruta)
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"[OK] Resultados guardados en '{args.salida}'.")
+
+
+if __name__ == "__main__":
+    main()
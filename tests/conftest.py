@@ -0,0 +1,9 @@
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Los ejercicios son scripts sueltos y mathlib no se instala para las pruebas
+for carpeta in (RAIZ, os.path.join(RAIZ, "OG", "lbrerias", "mathlib")):
+    if carpeta not in sys.path:
+        sys.path.insert(0, carpeta)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import Ejercicio1 as E
+from test_exacto import escribir_csv, leer_csv
+
+FILAS = [["SUM", 1, 2, 3], ["POW", 2, 10, 1024], ["DIV", 1, 0, ""], ["SUM", 1, 2, 3]]
+
+
+def archivos(tmp_path, n):
+    rutas = []
+    for i in range(n):
+        ruta = tmp_path / f"datos{i}.csv"
+        escribir_csv(ruta, FILAS)
+        rutas.append(str(ruta))
+    return rutas
+
+
+@pytest.mark.parametrize("opciones", [{"hilos": 4}, {"hilos": 1, "asincrono": True}])
+def test_cache_en_disco_compartida_entre_hilos(tmp_path, opciones):
+    rutas = archivos(tmp_path, 4)
+    with E.CacheOperaciones(ruta_disco=str(tmp_path / "cache.sqlite")) as cache:
+        resumen, fallidos = E.procesar_varios(rutas, cache=cache, **opciones)
+    assert fallidos == 0
+    assert (resumen.total, resumen.correctas, resumen.errores) == (16, 12, 4)
+    assert cache.fallos == 3
+    esperado = leer_csv(rutas[0])
+    assert all(leer_csv(ruta) == esperado for ruta in rutas)
+
+
+def test_calcular_desde_muchos_hilos_coincide_con_la_ruta_fila_a_fila(tmp_path):
+    pares = [("POW", a, b) for a in range(-5, 6) for b in range(-3, 4)] * 20
+    with E.CacheOperaciones(tamano=16, ruta_disco=str(tmp_path / "cache.sqlite")) as cache:
+        with ThreadPoolExecutor(max_workers=8) as ejecutor:
+            obtenidos = list(ejecutor.map(lambda par: cache.calcular(*par), pares))
+    assert obtenidos == [E.calcular_operacion(*par) for par in pares]
+
+
+def test_opciones_de_cache_en_la_linea_de_comandos(tmp_path, capsys):
+    rutas = archivos(tmp_path, 2)
+    disco = str(tmp_path / "cache.sqlite")
+    assert E.main(rutas + ["--cache-disco", disco, "--cache-tamano", "8"]) == 0
+    assert E.main(rutas + ["--cache-disco", disco]) == 0
+    salida = capsys.readouterr().out.splitlines()
+    assert "0 fallos" in salida[-1] and "/65536 entradas" in salida[-1]
+    with pytest.raises(SystemExit):
+        E.main(rutas + ["--cache", "--vectorizado"])
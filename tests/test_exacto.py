@@ -0,0 +1,53 @@
+import csv
+
+import pytest
+
+import Ejercicio1 as E
+
+
+def escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["operation", "operand_1", "operand_2", "correct_result"])
+        escritor.writerows(filas)
+
+
+def leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_resultado_mas_largo_que_el_limite_de_digitos_es_error():
+    # 1000 ** 1500 tiene 4501 dígitos; su costo (~14949 bits) pasa el tope pedido
+    resultado, hubo_error = E.calcular_operacion_exacta("POW", 1000, 1500, max_bits=20000)
+    assert (resultado, hubo_error) == (None, True)
+
+
+def test_resultado_justo_en_el_limite_se_calcula():
+    bits = E.max_bits_texto()
+    resultado, hubo_error = E.calcular_operacion_exacta("POW", 2, bits - 1, max_bits=bits)
+    assert not hubo_error
+    assert len(str(resultado)) <= 4300
+
+
+def test_procesar_archivo_no_pierde_el_csv(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    escribir_csv(ruta, [["POW", "1000", "1500", "1"], ["POW", "2", "10", "1024"]])
+    resumen = E.procesar_archivo_csv(str(ruta), exacto=True, max_bits=20000, mostrar=False)
+    filas = leer_csv(ruta)
+    assert [f["computed_result"] for f in filas] == ["ERROR", "1024"]
+    assert (resumen.errores, resumen.correctas) == (1, 1)
+
+
+def test_cache_en_disco_con_resultado_enorme(tmp_path):
+    with E.CacheOperaciones(ruta_disco=str(tmp_path / "cache.db"), exacto=True,
+                            max_bits=20000) as cache:
+        assert cache.calcular("POW", 1000, 1500) == (None, True)
+        assert cache.calcular("POW", 2, 10) == (1024, False)
+
+
+def test_max_bits_por_encima_del_limite_se_rechaza(capsys):
+    with pytest.raises(SystemExit):
+        E.main(["x.csv", "--exacto", "--max-bits", "20000"])
+    assert "--max-bits" in capsys.readouterr().err
+
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from mathlib import compile_expression
+
+COLUMNS = {"x": [1, 2, 3, -4], "y": [2, -1, 0.5, 3]}
+
+
+@pytest.mark.parametrize("text", [
+    "x ** 2 - 2 ** -1",
+    "x ** -2",
+    "2 ** -x + y",
+    "x ** y",
+    "-x ** 2 / (y + 10)",
+    "(x + y) * 3 - x / 4",
+])
+def test_batch_matches_scalar(text):
+    expression = compile_expression(text)
+    expected = [expression(x=x, y=y) for x, y in zip(COLUMNS["x"], COLUMNS["y"])]
+    np.testing.assert_allclose(expression.evaluate(COLUMNS), expected, rtol=1e-15)
+
+
+def test_batch_division_by_zero_is_nan():
+    result = compile_expression("x / (y - 2)").evaluate(COLUMNS)
+    assert np.isnan(result[0])
+    with pytest.raises(ValueError):
+        compile_expression("x / (y - 2)")(x=1, y=2)
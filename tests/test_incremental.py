@@ -0,0 +1,76 @@
+import csv
+
+import pytest
+
+import Ejercicio1 as E
+
+
+FILAS = [
+    ["SUM", "1", "2", "3"],
+    ["POW", "3", "40", str(3 ** 40)],
+    ["POW", "1000", "200", str(1000 ** 200)],
+    ["DIV", "1", "0", ""],
+    ["MUL", "2", "2.5", "5"],
+]
+
+
+def escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["operation", "operand_1", "operand_2", "correct_result"])
+        escritor.writerows(filas)
+
+
+def leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def tolerancia_original():
+    original = E.TOLERANCIA_POR_DEFECTO
+    yield
+    E.configurar_tolerancia(original)
+
+
+def procesar(ruta, **opciones):
+    return E.procesar_archivo_csv(str(ruta), mostrar=False, **opciones)
+
+
+def test_incremental_coincide_con_la_ruta_fila_a_fila(tmp_path):
+    incremental, completo = tmp_path / "a.csv", tmp_path / "b.csv"
+    escribir_csv(incremental, FILAS[:3])
+    procesar(incremental, incremental=True)
+    # Se agregan filas al final y se vuelve a procesar
+    with open(incremental, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(FILAS[3:])
+    resumen = procesar(incremental, incremental=True)
+    escribir_csv(completo, FILAS)
+    procesar(completo)
+
+    assert resumen.omitidas == 3
+    assert leer_csv(incremental) == leer_csv(completo)
+
+
+def test_cambiar_a_modo_exacto_recalcula_todo(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    escribir_csv(ruta, FILAS)
+    flotante = procesar(ruta, incremental=True)
+    exacto = procesar(ruta, incremental=True, exacto=True)
+
+    assert exacto.omitidas == 0
+    # En float 1000 ** 200 desborda; con enteros se calcula
+    assert (flotante.errores, exacto.errores) == (2, 1)
+    assert leer_csv(ruta)[3][4] == str(1000 ** 200)
+    # Con los mismos ajustes vuelve a omitir todo
+    assert procesar(ruta, incremental=True, exacto=True).omitidas == len(FILAS)
+
+
+def test_cambiar_la_tolerancia_recalcula_todo(tmp_path, tolerancia_original):
+    ruta = tmp_path / "datos.csv"
+    escribir_csv(ruta, [["SUM", "1", "2", "3.5"]] * 4)
+    assert procesar(ruta, incremental=True).correctas == 0
+
+    E.configurar_tolerancia(E.Tolerancia(0, 1.0))
+    resumen = procesar(ruta, incremental=True)
+    assert (resumen.omitidas, resumen.correctas) == (0, 4)
@@ -0,0 +1,47 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import Ejercicio1 as E
+from test_exacto import escribir_csv, leer_csv
+
+
+def filas_aleatorias(n=500):
+    azar = random.Random(7)
+    filas = []
+    for _ in range(n):
+        operacion = azar.choice(["SUM", "SUB", "MUL", "DIV", "POW", "XYZ"])
+        a = round(azar.uniform(-50, 50), 3)
+        b = azar.choice([0, round(azar.uniform(-8, 8), 3)])
+        esperado, hubo_error = E.calcular_operacion(operacion, a, b)
+        filas.append([operacion, a, b, "" if hubo_error else repr(esperado)])
+    return filas
+
+
+@pytest.mark.parametrize("modo", [{"vectorizado": True}, {"mapeado": True}])
+def test_lotes_coincide_con_la_ruta_fila_a_fila(tmp_path, modo):
+    filas = filas_aleatorias()
+    ruta_fila, ruta_lote = tmp_path / "fila.csv", tmp_path / "lote.csv"
+    escribir_csv(ruta_fila, filas)
+    escribir_csv(ruta_lote, filas)
+    resumen_fila = E.procesar_archivo_csv(str(ruta_fila), mostrar=False)
+    resumen_lote = E.procesar_archivo_csv(str(ruta_lote), mostrar=False, **modo)
+    assert vars(resumen_lote) == vars(resumen_fila)
+
+    for fila, lote in zip(leer_csv(ruta_fila), leer_csv(ruta_lote)):
+        assert lote["is_correct"] == fila["is_correct"]
+        if fila["computed_result"] == "ERROR":
+            assert lote["computed_result"] == "ERROR"
+        else:
+            # Solo puede cambiar el último bit (np.power frente a **)
+            assert math.isclose(float(lote["computed_result"]),
+                                float(fila["computed_result"]), rel_tol=4e-16)
+
+
+@pytest.mark.parametrize("tipo", ["U", "S"])
+def test_codificar_operaciones_con_textos_largos(tipo):
+    operaciones = np.array(["SUM", "MULTIPLICAR", "SUM", "POW"]).astype(tipo)
+    codigos, textos = E._codificar_operaciones(operaciones)
+    assert [textos[c] for c in codigos] == ["SUM", "MULTIPLICAR", "SUM", "POW"]
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+MATHLIB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "OG", "lbrerias", "mathlib")
+
+
+def test_scalar_operations_work_without_numpy():
+    # numpy may already be imported in this process, so block it in a new one
+    codigo = textwrap.dedent("""
+        import sys
+
+        class SinNumpy:
+            def find_spec(self, name, path=None, target=None):
+                if name.split('.')[0] == 'numpy':
+                    raise ImportError('numpy blocked')
+
+        sys.meta_path.insert(0, SinNumpy())
+        import mathlib
+        assert (mathlib.add(2, 3), mathlib.subtract(2, 3)) == (5, -1)
+        assert 'numpy' not in sys.modules
+        try:
+            mathlib.add_batch
+        except ImportError:
+            pass
+        else:
+            raise AssertionError('add_batch should need numpy')
+    """)
+    entorno = dict(os.environ, PYTHONPATH=MATHLIB)
+    subprocess.run([sys.executable, "-c", codigo], check=True, env=entorno)
+
+
+def test_lazy_names_are_exported():
+    import mathlib
+    from mathlib import compile_expression, divide_batch, stream_sum
+
+    assert {"add_batch", "Expression", "RunningStats"} <= set(dir(mathlib))
+    assert mathlib.stream_sum is stream_sum
+    assert divide_batch([1.0], [0.0])[1].tolist() == [True]
+    assert compile_expression("a - b")(a=3, b=1) == 2
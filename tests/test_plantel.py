@@ -0,0 +1,80 @@
+import random
+
+import pandas as pd
+import pytest
+
+import Ejercicio2 as E2
+
+POKEMONS = [
+    {"name": "Bulbasaur", "type_1": "Grass", "hp": 45, "attack": 49, "defense": 49, "speed": 45},
+    {"name": "Charmander", "type_1": "Fire", "hp": 39, "attack": 52, "defense": 43, "speed": 65},
+    {"name": "Squirtle", "type_1": "Water", "hp": 44, "attack": 48, "defense": 65, "speed": 43},
+]
+
+
+def test_escribir_en_df_no_cambia_el_plantel():
+    juego = E2.PokemonGame()
+    juego.df = pd.DataFrame(POKEMONS, columns=E2.COLUMNAS)
+    id_fila = juego.df.index[0]
+
+    copia = juego.df
+    copia.at[id_fila, "hp"] = 999
+    assert juego.df.at[id_fila, "hp"] == 45
+
+    juego.plantel.actualizar(id_fila, {"hp": 50})
+    assert juego.df.at[id_fila, "hp"] == 50
+
+
+def comparar(plantel, modelo):
+    assert len(plantel) == len(modelo)
+    for id_fila, datos in modelo.items():
+        assert plantel.fila(id_fila) == datos
+    df = plantel.df
+    assert df.index.tolist() == sorted(modelo)
+    assert df.to_dict("index") == modelo
+    nombres = {datos["name"].casefold() for datos in modelo.values()}
+    for clave in nombres | {"nadie"}:
+        esperados = sorted(i for i, datos in modelo.items() if datos["name"].casefold() == clave)
+        assert plantel.buscar(clave.upper()) == esperados
+
+
+def test_crud_coincide_con_un_diccionario():
+    azar = random.Random(3)
+    nombres = ["Pikachu", "pikachu", "Eevee", "Mew", "Ditto"]
+
+    def pokemon():
+        return {"name": azar.choice(nombres), "type_1": azar.choice(["Fire", "Water", "Grass"]),
+                "hp": azar.randint(1, 255), "attack": azar.randint(1, 255),
+                "defense": azar.randint(1, 255), "speed": azar.randint(1, 255)}
+
+    plantel = E2.Plantel(pd.DataFrame(POKEMONS, columns=E2.COLUMNAS))
+    modelo = dict(enumerate(POKEMONS))
+    borrados = []
+    # Suficientes bajas para que el plantel se compacte varias veces
+    for paso in range(6000):
+        accion = azar.random()
+        if accion < 0.4 or not modelo:
+            datos = pokemon()
+            modelo[plantel.agregar(datos)] = datos
+        elif accion < 0.6:
+            id_fila = azar.choice(list(modelo))
+            cambios = {"name": azar.choice(nombres), "hp": azar.choice([10, 70_000])}
+            plantel.actualizar(id_fila, cambios)
+            modelo[id_fila] = {**modelo[id_fila], **cambios}
+        else:
+            id_fila = azar.choice(list(modelo))
+            plantel.eliminar(id_fila)
+            del modelo[id_fila]
+            borrados.append(id_fila)
+        if paso % 1000 == 0:
+            comparar(plantel, modelo)
+
+    comparar(plantel, modelo)
+    for id_fila in borrados[-10:]:
+        assert id_fila not in plantel
+        with pytest.raises(KeyError):
+            plantel.fila(id_fila)
+        with pytest.raises(KeyError):
+            plantel.eliminar(id_fila)
+    # Los ids siguen creciendo aunque se hayan borrado filas
+    assert plantel.agregar(pokemon()) == max([*modelo, *borrados]) + 1
@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from mathlib import RunningStats, stream_max, stream_min, stream_sum
+
+
+@pytest.mark.parametrize("values", [
+    [1e100, 1.0, -1e100],
+    iter([1e16, 1.0, -1e16]),
+    np.array([1e16, 1.0, -1e16]),
+    [np.array([1e16]), 1.0, [-1e16]],
+])
+def test_cancellation_inside_a_chunk(values):
+    assert stream_sum(values) == 1.0
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_sum_matches_fsum_across_chunks(exact):
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(10_000) * 10.0 ** rng.integers(-8, 12, 10_000)
+    expected = math.fsum(values.tolist())
+    chunked = RunningStats(exact=exact, chunk_size=777).consume(values.tolist())
+    assert chunked.sum == pytest.approx(expected, rel=1e-15, abs=0)
+    assert stream_sum(values, exact=exact) == pytest.approx(expected, rel=1e-15, abs=0)
+
+
+def test_non_finite_values_follow_numpy():
+    assert stream_sum([1.0, math.inf]) == math.inf
+    assert math.isnan(stream_sum([math.inf, -math.inf]))
+    assert stream_sum([1e308, 1e308, -1e308]) == math.inf
+
+
+def test_nan_propagates_unless_ignored():
+    values = [3.0, math.nan, 1.0]
+    assert math.isnan(stream_sum(values))
+    assert math.isnan(stream_min(values))
+    assert stream_sum(values, ignore_nan=True) == 4.0
+    assert stream_max(values, ignore_nan=True) == 3.0
+
+
+def test_merge_equals_single_pass():
+    values = np.linspace(-1.0, 1.0, 5001) ** 3
+    left = RunningStats().consume([values[:2000]])
+    right = RunningStats().consume(values[2000:].tolist())
+    whole = RunningStats().consume([values])
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.sum == pytest.approx(whole.sum, abs=1e-12)
+    assert left.variance() == pytest.approx(whole.variance(), rel=1e-12)